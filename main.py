@@ -21,7 +21,7 @@ from rpython.rlib.debug import debug_print
 from rpython.rlib.jit import set_user_param
 
 from typhon import rsodium, ruv
-from typhon.arguments import Configuration
+from typhon.arguments import BadArguments, Configuration
 from typhon.debug import enableDebugPrint, TyphonJitHooks
 from typhon.errors import LoadFailed, UserException
 from typhon.importing import obtainModule
@@ -42,7 +42,7 @@ from typhon.profile import registerProfileTyphon
 from typhon.scopes.boot import bootScope
 from typhon.scopes.safe import safeScope
 from typhon.scopes.unsafe import unsafeScope
-from typhon.vats import Vat, VatManager, scopedVat
+from typhon.vats import Vat, VatManager, runUntilDone, scopedVat
 
 # We must do this once and now seems like the best time. ~ C.
 tieMirandaKnot()
@@ -86,37 +86,6 @@ def loadPrelude(config, recorder, vat):
     return prelude
 
 
-def runUntilDone(vatManager, uv_loop, recorder):
-    # This may take a while.
-    anyVatHasTurns = vatManager.anyVatHasTurns()
-    while anyVatHasTurns or ruv.loopAlive(uv_loop):
-        for vat in vatManager.vats:
-            if vat.hasTurns():
-                with scopedVat(vat) as vat:
-                    with recorder.context("Time spent in vats"):
-                        vat.takeSomeTurns()
-
-        if ruv.loopAlive(uv_loop):
-            with recorder.context("Time spent in I/O"):
-                ruv.cleanup()
-                try:
-                    if anyVatHasTurns:
-                        # More work to be done, so don't block.
-                        ruv.run(uv_loop, ruv.RUN_NOWAIT)
-                    else:
-                        # No more work to be done, so blocking is fine.
-                        ruv.run(uv_loop, ruv.RUN_ONCE)
-                except CompilerFailed as cf:
-                    debug_print("Caught fatal exception while reacting:",
-                            cf.formatError())
-                    raise
-                except UserException as ue:
-                    debug_print("Caught exception while reacting:",
-                            ue.formatError())
-
-        anyVatHasTurns = vatManager.anyVatHasTurns()
-
-
 class profiling(object):
 
     def __init__(self, path, enabled):
@@ -164,7 +133,11 @@ def runTyphon(argv):
         print "Couldn't initialize libsodium!"
         return 1
 
-    config = Configuration(argv)
+    try:
+        config = Configuration(argv)
+    except BadArguments as ba:
+        print ba.message
+        return 1
 
     if config.verbose:
         enableDebugPrint()
@@ -186,7 +159,8 @@ def runTyphon(argv):
 
     # Initialize our first vat. It shall be immortal.
     vatManager = VatManager()
-    vat = Vat(vatManager, uv_loop, checkpoints=-1)
+    vat = Vat(vatManager, uv_loop, checkpoints=-1,
+              timeTurns=config.statistics)
     vatManager.vats.append(vat)
 
     # Update loop timing information. Until the loop really gets going, we
@@ -265,7 +239,7 @@ def runTyphon(argv):
         # Update loop timing information.
         ruv.update_time(uv_loop)
         try:
-            runUntilDone(vatManager, uv_loop, recorder)
+            runUntilDone(vatManager, uv_loop, recorder, config.turnSlice)
             rv = resolution(result) if result is not None else NullObject
             if isinstance(rv, IntObject):
                 exitStatus = rv.getInt()
@@ -275,6 +249,10 @@ def runTyphon(argv):
             # exitStatus = se.code
         finally:
             recorder.stop()
+            if config.statistics:
+                for vat in vatManager.vats:
+                    recorder.addTurnStatistics(vat.name.encode("utf-8"),
+                                               vat.statistics)
             recorder.printResults()
 
     # Clean up and exit.
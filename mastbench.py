@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+
+"""
+Time how long it takes to deserialize MAST files.
+
+Usage: mastbench.py [iterations] [path...]
+"""
+
+import sys
+from time import time
+
+from typhon.load.nano import loadMASTBytes
+
+DEFAULT_PATHS = ["boot/lib/monte/monte_parser.mast"]
+
+
+def bench(path, iterations):
+    with open(path, "rb") as handle:
+        bs = handle.read()
+    # Warm up once, so that the first load's allocations don't count.
+    loadMASTBytes(bs)
+    start = time()
+    for _ in range(iterations):
+        loadMASTBytes(bs)
+    taken = (time() - start) / iterations
+    print "%s: %d bytes, %.3f ms per load" % (path, len(bs), taken * 1000)
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    paths = sys.argv[2:] or DEFAULT_PATHS
+    for path in paths:
+        bench(path, iterations)
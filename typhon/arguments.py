@@ -13,6 +13,31 @@
 # under the License.
 
 
+class BadArguments(Exception):
+    """
+    The command line could not be understood.
+    """
+
+    def __init__(self, message):
+        self.message = message
+
+
+def parseMilliseconds(flag, item):
+    """
+    Parse the positive number of milliseconds given to `flag`.
+    """
+
+    try:
+        ms = int(item)
+    except ValueError:
+        raise BadArguments("%s: Expected a number of milliseconds, not %s" %
+                           (flag, item))
+    if ms <= 0:
+        raise BadArguments("%s: Must be at least one millisecond, not %d" %
+                           (flag, ms))
+    return ms
+
+
 class ListStream(object):
 
     _counter = 0
@@ -53,10 +78,17 @@ class Configuration(object):
     # Whether to run benchmarks.
     benchmark = False
 
+    # Whether vats should time their turns and report statistics at exit.
+    statistics = False
+
     # User settings for the JIT. By default:
     # * The trace limit is over 9000 and prime.
     jit = "trace_limit=9001"
 
+    # How long, in milliseconds, vats may take turns before I/O is polled
+    # again.
+    turnSlice = 5
+
     def __init__(self, argv):
         # Arguments not consumed by Typhon. Will be available to the main
         # script.
@@ -92,8 +124,12 @@ class Configuration(object):
                 self.profile = True
             elif item == "-b":
                 self.benchmark = True
+            elif item == "-stats":
+                self.statistics = True
             elif item == "--jit":
                 self.jit = stream.nextItem()
+            elif item == "-turn-slice":
+                self.turnSlice = parseMilliseconds(item, stream.nextItem())
             else:
                 self.argv.append(item)
 
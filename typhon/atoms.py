@@ -20,13 +20,17 @@ class Atom(object):
     A verb and arity.
 
     Only compare by identity.
+
+    Each atom also carries a small dense index, unique among atoms, which is
+    suitable for switching on.
     """
 
     _immutable_ = True
 
-    def __init__(self, verb, arity):
+    def __init__(self, verb, arity, index):
         self.verb = verb
         self.arity = arity
+        self.index = index
         self.repr = "Atom(%s/%d)" % (self.verb.encode("utf-8"), self.arity)
 
     def __repr__(self):
@@ -50,7 +54,7 @@ class _AtomHolder(object):
 
         key = verb, arity
         if key not in self.atoms:
-            self.atoms[key] = Atom(verb, arity)
+            self.atoms[key] = Atom(verb, arity, len(self.atoms))
         return self.atoms[key]
 
 
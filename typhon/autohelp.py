@@ -7,7 +7,6 @@ import inspect
 
 import py
 
-from rpython.rlib.jit import dont_look_inside
 from rpython.rlib.unroll import unrolling_iterable
 
 from typhon.atoms import getAtom
@@ -42,6 +41,10 @@ def method(rv, *args, **kwargs):
 
     The first type must be the return value.
 
+    Pass `_pure=True` for methods which have no side effects and whose
+    results depend only upon their arguments; the compiler may run them
+    early.
+
     NOT_RPYTHON
     """
 
@@ -50,6 +53,7 @@ def method(rv, *args, **kwargs):
 
     def deco(f):
         verb = kwargs.pop("_verb", f.__name__)
+        f._pure_ = kwargs.pop("_pure", False)
         # This method shall be isolated, repacked, wrapped, and helped.
         f._monteMethod_ = verb, args, kwargs, rv, False
         return f
@@ -65,6 +69,7 @@ def method_py(rv, *args, **kwargs):
 
     def deco(f):
         verb = kwargs.pop("_verb", f.__name__)
+        f._pure_ = kwargs.pop("_pure", False)
         # This method shall be spared.
         f._monteMethod_ = verb, args, kwargs, rv, True
         return f
@@ -175,18 +180,26 @@ def alterMethods(cls):
         execNames[name] = lit
         return name
 
-    dispatchClauses = []
+    # Clauses are grouped by atom; clauses for star-args methods can't be
+    # keyed on an atom, and are tested by verb instead.
+    atomClauses = {}
+    # The declared return type of each atom, or "Any" if its overloads
+    # disagree. Static analysis can use these to infer result types.
+    returnTypes = {}
+    # The atoms whose every overload is pure.
+    pureAtoms = {}
+    starClauses = []
     methods = harvestMethods(cls)
     for attr, (f, verb, args, kwargs, rv) in methods.iteritems():
         assignments = []
         if isStarArgs(args):
+            atom = None
             atomTest = "atom.verb == %r" % verb
             call = "self.%s(args)" % attr
         else:
             atom = getAtom(verb, len(args))
-            atomName = namedLiteral(atom)
             atoms.append(atom)
-            atomTest = "atom is %s" % atomName
+            atomTest = "True"
             argNames = []
             for i, arg in enumerate(args):
                 argName = nextName()
@@ -243,18 +256,49 @@ def alterMethods(cls):
             retvals.append("return %s(rv)" % wrapper)
         # We need to use newlines for the assignments since kwarg assignments
         # are conditional.
-        dispatchClauses.append("""
+        clause = """
  if %s:
   %s
   rv = %s
   %s
-""" % (atomTest, "\n  ".join(assignments), call, ";".join(retvals)))
+""" % (atomTest, "\n  ".join(assignments), call, ";".join(retvals))
+        if atom is None:
+            starClauses.append(clause)
+        else:
+            atomClauses.setdefault(atom, []).append(clause)
+            if returnTypes.setdefault(atom, rv) != rv:
+                returnTypes[atom] = "Any"
+            pureAtoms[atom] = pureAtoms.get(atom, True) and f._pure_
         setattr(cls, attr, f)
     # Temporary. Soon, all classes shall receive AutoHelp, and no class will
     # have a handwritten recv().
-    if dispatchClauses:
+    if atomClauses or starClauses:
+        # Each atom gets its own dispatch function, which returns None if
+        # none of its clauses accepted the arguments. .recvNamed() then
+        # switches on the atom's index; RPython turns the chain of integer
+        # comparisons into a C switch, and the JIT folds it away for
+        # promoted atoms. Keeping the clauses out of .recvNamed() also keeps
+        # its JIT constant pool small, no matter how many methods the class
+        # has; long dispatch chains used to overflow the pool and had to be
+        # hidden from the JIT.
+        cases = []
+        for atom, clauses in atomClauses.iteritems():
+            dispatcher = "_recv_%d" % atom.index
+            exec py.code.Source("""
+def %s(self, args, namedArgs):
+ %s
+ %s
+ return None
+""" % (dispatcher, ";".join(imports), "\n".join(clauses))).compile() in execNames
+            cases.append("""
+ %s index == %d:
+  rv = %s(self, args, namedArgs)
+  if rv is not None:
+   return rv""" % ("elif" if cases else "if", atom.index, dispatcher))
         exec py.code.Source("""
 def recvNamed(self, atom, args, namedArgs):
+ %s
+ index = atom.index
  %s
  %s
  rv = self.mirandaMethods(atom, args, namedArgs)
@@ -262,26 +306,12 @@ def recvNamed(self, atom, args, namedArgs):
   raise Refused(self, atom, args)
  else:
   return rv
-""" % (";".join(imports), "\n".join(dispatchClauses))).compile() in execNames
-        recvNamed = execNames["recvNamed"]
-        # This is the place for fixing the "too many constants" JIT
-        # translation error. If there's too many dispatch clauses in
-        # .recvNamed(), then the JIT transformation fails because too many
-        # constant values are being mixed in. This number is determined
-        # empirically; uncomment the next line to take measurements:
-        # print "Made %d dispatch clauses for %r" % (len(dispatchClauses), cls)
-        # Here's a worksheet. Please keep it up-to-date when altering this
-        # section of code. ~ C.
-        # * At last run, the longest working list of clauses had length 40
-        # * And the shortest list which broke translation had length 46
-        # * Assuming that each clause has a constant integral number of
-        #   constants, the number of constants per clause is 6
-        # * The maximum number of allowed constants is 255
-        # * Therefore, the longest working list can have maximum length 42
-        if len(dispatchClauses) >= 42:
-            # Too many constants; forbid the JIT from recursing into us.
-            recvNamed = dont_look_inside(recvNamed)
-        cls.recvNamed = recvNamed
+""" % (";".join(imports), "".join(cases),
+       "\n".join(starClauses))).compile() in execNames
+        cls.recvNamed = execNames["recvNamed"]
+    cls._returnTypes_ = returnTypes
+    cls._pureAtoms_ = dict.fromkeys([atom for atom, pure in
+                                     pureAtoms.iteritems() if pure])
 
     return atoms
 
@@ -25,6 +25,19 @@ class Ejecting(Exception):
         self.value = value
 
 
+class LocalEjecting(Exception):
+    """
+    A localized ejector is currently being used.
+
+    Localized ejectors are never reified; they are identified by the local
+    index which would have held them.
+    """
+
+    def __init__(self, index, value):
+        self.index = index
+        self.value = value
+
+
 class LoadFailed(Exception):
     """
     An AST couldn't be loaded.
@@ -43,6 +56,26 @@ def printObjTerse(obj):
     return s
 
 
+class TrailFrame(object):
+    """
+    A single frame of an exception's trail.
+
+    Frames only hold references to the objects involved; nothing is printed
+    until the trail is formatted. Frames are chained from the outermost call
+    inwards, so that adding a frame is a single allocation and so that
+    exceptions can share their trails.
+    """
+
+    _immutable_ = True
+
+    def __init__(self, target, atom, args, span, inner):
+        self.target = target
+        self.atom = atom
+        self.args = args
+        self.span = span
+        self.inner = inner
+
+
 class UserException(Exception):
     """
     An error occurred in user code.
@@ -55,7 +88,7 @@ class UserException(Exception):
             self.trail = payload.ue.trail
         else:
             self.payload = payload
-            self.trail = []
+            self.trail = None
 
     def __str__(self):
         return self.formatError().encode("utf-8")
@@ -77,11 +110,24 @@ class UserException(Exception):
         Add a traceback frame to this exception.
         """
 
-        self.trail.append((target, atom, args, span))
+        self.trail = TrailFrame(target, atom, args, span, self.trail)
 
     def formatTrail(self):
+        # The chain starts at the outermost frame, but the trail is formatted
+        # from the innermost frame outwards.
+        frames = []
+        frame = self.trail
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.inner
+        frames.reverse()
+
         rv = []
-        for target, atom, args, span in self.trail:
+        for frame in frames:
+            target = frame.target
+            atom = frame.atom
+            args = frame.args
+            span = frame.span
             argStringList = [printObjTerse(arg) for arg in args]
             argString = u", ".join(argStringList)
             if span is None:
@@ -113,7 +159,7 @@ class Refused(UserException):
         self.target = target
         self.atom = atom
         self.args = args
-        self.trail = []
+        self.trail = None
 
     def error(self):
         l = []
@@ -138,7 +184,7 @@ class WrongType(UserException):
 
     def __init__(self, message):
         self.message = message
-        self.trail = []
+        self.trail = None
 
         from typhon.objects.data import StrObject
         self.payload = StrObject(u"Object had incorrect type")
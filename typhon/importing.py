@@ -84,10 +84,16 @@ class Module(Object):
 
 
 class AstModule(Module):
+    def __init__(self, recorder, origin):
+        Module.__init__(self, recorder, origin)
+        # The output of the main nanopass pipeline, by scope names.
+        self.pipelineCache = {}
+
     def load(self, source):
         with self.recorder.context("Deserialization"):
             self.astSource = nanoLoad(source)
 
     @dont_look_inside
     def eval(self, env):
-            return evalMonte(self.astSource, env, self.origin, False)
+            return evalMonte(self.astSource, env, self.origin, False,
+                             self.pipelineCache)
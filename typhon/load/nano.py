@@ -1,7 +1,12 @@
 """
-The MAST format, version zero, nanopass version.
+The MAST format, versions zero through two, nanopass version.
+
+Version two starts with a header: a table of every string in the stream,
+and the number of exprs and patterns. Every string after the header is an
+index into the table.
 """
 
+from rpython.rlib.rarithmetic import LONG_BIT
 from rpython.rlib.rbigint import rbigint
 from rpython.rlib.rstruct.ieee import unpack_float
 from rpython.rlib.runicode import str_decode_utf_8
@@ -18,10 +23,15 @@ class InvalidMAST(Exception):
 
 MAGIC = "Mont\xe0MAST"
 
+# The largest shift at which another seven bits still fit into a machine int
+# without touching the sign bit.
+MAX_SHIFT = LONG_BIT - 8
+
 
 class MASTStream(object):
 
     index = 0
+    strings = None
 
     def __init__(self, bytes, withSpans, source):
         self.bytes = bytes
@@ -60,9 +70,12 @@ class MASTStream(object):
         except ValueError:
             raise InvalidMAST("Couldn't decode invalid double")
 
-    def nextVarInt(self):
-        shift = 0
-        bi = rbigint.fromint(0)
+    def nextBigVarInt(self, acc, shift):
+        """
+        Finish reading a varint which has outgrown a machine int.
+        """
+
+        bi = rbigint.fromint(acc)
         cont = True
         while cont:
             b = ord(self.nextByte())
@@ -71,13 +84,50 @@ class MASTStream(object):
             cont = bool(b & 0x80)
         return bi
 
+    def nextSmallVarInt(self):
+        """
+        Read as much of a varint as fits in a machine int.
+
+        Return the value read so far and the shift for the next byte. The
+        shift is zero if the varint is complete.
+        """
+
+        # Nearly every varint is small, so accumulate in a machine int and
+        # only switch to bigints when the next byte might not fit.
+        shift = 0
+        acc = 0
+        while shift <= MAX_SHIFT:
+            b = ord(self.nextByte())
+            acc |= (b & 0x7f) << shift
+            if not b & 0x80:
+                return acc, 0
+            shift += 7
+        return acc, shift
+
+    def nextVarInt(self):
+        acc, shift = self.nextSmallVarInt()
+        if shift:
+            return self.nextBigVarInt(acc, shift)
+        return rbigint.fromint(acc)
+
     def nextInt(self):
-        try:
-            return self.nextVarInt().toint()
-        except OverflowError:
-            raise InvalidMAST("String length overflows integer bounds")
+        acc, shift = self.nextSmallVarInt()
+        if shift:
+            try:
+                return self.nextBigVarInt(acc, shift).toint()
+            except OverflowError:
+                raise InvalidMAST("String length overflows integer bounds")
+        return acc
 
     def nextStr(self):
+        if self.strings is not None:
+            index = self.nextInt()
+            if not 0 <= index < len(self.strings):
+                raise InvalidMAST("String index %d is out of bounds" % index)
+            return self.strings[index]
+        return self.nextRawStr()
+
+    def nextRawStr(self):
         size = self.nextInt()
         if size == 0:
             return u""
@@ -107,6 +157,9 @@ class MASTStream(object):
 
 class MASTContext(object):
 
+    exprCount = 0
+    pattCount = 0
+
     def __init__(self, noisy=False):
         self.exprs = []
         self.patts = []
@@ -116,17 +169,38 @@ class MASTContext(object):
     def __repr__(self):
         return "<Context(exprs=%r, patts=%r)>" % (self.exprs, self.patts)
 
+    def reserve(self, exprCount, pattCount):
+        self.exprs = [None] * exprCount
+        self.patts = [None] * pattCount
+
+    def pushExpr(self, expr):
+        if self.exprCount < len(self.exprs):
+            self.exprs[self.exprCount] = expr
+        else:
+            self.exprs.append(expr)
+        self.exprCount += 1
+
+    def pushPatt(self, patt):
+        if self.pattCount < len(self.patts):
+            self.patts[self.pattCount] = patt
+        else:
+            self.patts.append(patt)
+        self.pattCount += 1
+
     def exprAt(self, index):
-        try:
-            return self.exprs[index]
-        except IndexError:
+        if not 0 <= index < self.exprCount:
             raise InvalidMAST("Expr index %d is out of bounds" % index)
+        return self.exprs[index]
 
     def pattAt(self, index):
-        try:
-            return self.patts[index]
-        except IndexError:
+        if not 0 <= index < self.pattCount:
             raise InvalidMAST("Pattern index %d is out of bounds" % index)
+        return self.patts[index]
+
+    def lastExpr(self):
+        if not self.exprCount:
+            raise InvalidMAST("No expressions in MAST")
+        return self.exprs[self.exprCount - 1]
 
     def nextExpr(self, stream):
         expr = self.exprAt(stream.nextInt())
@@ -196,10 +270,10 @@ class MASTContext(object):
                         rv, count = str_decode_utf_8(buf, len(buf), None)
                 except UnicodeDecodeError:
                     raise InvalidMAST("Couldn't decode char %s" % buf)
-                self.exprs.append(MastIR.CharExpr(rv, stream.nextSpan()))
+                self.pushExpr(MastIR.CharExpr(rv, stream.nextSpan()))
             elif literalTag == 'D':
                 # Double.
-                self.exprs.append(MastIR.DoubleExpr(stream.nextDouble(),
+                self.pushExpr(MastIR.DoubleExpr(stream.nextDouble(),
                     stream.nextSpan()))
             elif literalTag == 'I':
                 # Int. Read a varint and un-zz it.
@@ -207,14 +281,14 @@ class MASTContext(object):
                 shifted = bi.rshift(1)
                 if bi.int_and_(1).toint():
                     shifted = shifted.int_xor(-1)
-                self.exprs.append(MastIR.IntExpr(shifted, stream.nextSpan()))
+                self.pushExpr(MastIR.IntExpr(shifted, stream.nextSpan()))
             elif literalTag == 'N':
                 # Null.
-                self.exprs.append(MastIR.NullExpr(stream.nextSpan()))
+                self.pushExpr(MastIR.NullExpr(stream.nextSpan()))
             elif literalTag == 'S':
                 # Str.
                 s = stream.nextStr()
-                self.exprs.append(MastIR.StrExpr(s, stream.nextSpan()))
+                self.pushExpr(MastIR.StrExpr(s, stream.nextSpan()))
             else:
                 raise InvalidMAST("Didn't know literal tag %s" % literalTag)
         elif tag == 'P':
@@ -227,68 +301,68 @@ class MASTContext(object):
                 # Final.
                 name = stream.nextStr()
                 guard = self.nextExpr(stream)
-                self.patts.append(MastIR.FinalPatt(name, guard, stream.nextSpan()))
+                self.pushPatt(MastIR.FinalPatt(name, guard, stream.nextSpan()))
             elif pattTag == 'I':
                 # Ignore.
                 guard = self.nextExpr(stream)
-                self.patts.append(MastIR.IgnorePatt(guard, stream.nextSpan()))
+                self.pushPatt(MastIR.IgnorePatt(guard, stream.nextSpan()))
             elif pattTag == 'V':
                 # Var.
                 name = stream.nextStr()
                 guard = self.nextExpr(stream)
-                self.patts.append(MastIR.VarPatt(name, guard, stream.nextSpan()))
+                self.pushPatt(MastIR.VarPatt(name, guard, stream.nextSpan()))
             elif pattTag == 'L':
                 # List.
                 patts = self.nextPatts(stream)
-                self.patts.append(MastIR.ListPatt(patts, stream.nextSpan()))
+                self.pushPatt(MastIR.ListPatt(patts, stream.nextSpan()))
             elif pattTag == 'A':
                 # Via.
                 expr = self.nextExpr(stream)
                 patt = self.nextPatt(stream)
-                self.patts.append(MastIR.ViaPatt(expr, patt, stream.nextSpan()))
+                self.pushPatt(MastIR.ViaPatt(expr, patt, stream.nextSpan()))
             elif pattTag == 'B':
                 # Binding.
                 name = stream.nextStr()
-                self.patts.append(MastIR.BindingPatt(name, stream.nextSpan()))
+                self.pushPatt(MastIR.BindingPatt(name, stream.nextSpan()))
             else:
                 raise InvalidMAST("Didn't know pattern tag %s" % pattTag)
         elif tag == 'N':
             # Noun.
             s = stream.nextStr()
-            self.exprs.append(MastIR.NounExpr(s, stream.nextSpan()))
+            self.pushExpr(MastIR.NounExpr(s, stream.nextSpan()))
         elif tag == 'B':
             # Binding.
             s = stream.nextStr()
-            self.exprs.append(MastIR.BindingExpr(s, stream.nextSpan()))
+            self.pushExpr(MastIR.BindingExpr(s, stream.nextSpan()))
         elif tag == 'S':
             # Sequence.
             exprs = self.nextExprs(stream)
-            self.exprs.append(MastIR.SeqExpr(exprs, stream.nextSpan()))
+            self.pushExpr(MastIR.SeqExpr(exprs, stream.nextSpan()))
         elif tag == 'C':
             # Call.
             target = self.nextExpr(stream)
             verb = stream.nextStr()
             args = self.nextExprs(stream)
             namedArgs = self.nextNamedExprs(stream)
-            self.exprs.append(MastIR.CallExpr(target, verb, args, namedArgs, stream.nextSpan()))
+            self.pushExpr(MastIR.CallExpr(target, verb, args, namedArgs, stream.nextSpan()))
         elif tag == 'D':
             # Def.
             patt = self.nextPatt(stream)
             exit = self.nextExpr(stream)
             expr = self.nextExpr(stream)
-            self.exprs.append(MastIR.DefExpr(patt, exit, expr, stream.nextSpan()))
+            self.pushExpr(MastIR.DefExpr(patt, exit, expr, stream.nextSpan()))
         elif tag == 'e':
             # Escape (no catch).
             escapePatt = self.nextPatt(stream)
             escapeExpr = self.nextExpr(stream)
-            self.exprs.append(MastIR.EscapeOnlyExpr(escapePatt, escapeExpr, stream.nextSpan()))
+            self.pushExpr(MastIR.EscapeOnlyExpr(escapePatt, escapeExpr, stream.nextSpan()))
         elif tag == 'E':
             # Escape (with catch).
             escapePatt = self.nextPatt(stream)
             escapeExpr = self.nextExpr(stream)
             catchPatt = self.nextPatt(stream)
             catchExpr = self.nextExpr(stream)
-            self.exprs.append(MastIR.EscapeExpr(escapePatt, escapeExpr,
+            self.pushExpr(MastIR.EscapeExpr(escapePatt, escapeExpr,
                                                 catchPatt, catchExpr, stream.nextSpan()))
         elif tag == 'O':
             # Object with no script, just direct methods and matchers.
@@ -298,7 +372,7 @@ class MASTContext(object):
             implements = self.nextExprs(stream)
             methods = self.nextMethods(stream)
             matchers = self.nextMatchers(stream)
-            self.exprs.append(MastIR.ObjectExpr(doc, patt,
+            self.pushExpr(MastIR.ObjectExpr(doc, patt,
                                                 [asExpr] + implements,
                                                 methods, matchers, stream.nextSpan()))
         elif tag == 'M':
@@ -311,59 +385,74 @@ class MASTContext(object):
                           in self.nextNamedPatts(stream)]
             guard = self.nextExpr(stream)
             block = self.nextExpr(stream)
-            self.exprs.append(MastIR.MethodExpr(doc, verb, patts, namedPatts,
+            self.pushExpr(MastIR.MethodExpr(doc, verb, patts, namedPatts,
                                                 guard, block, stream.nextSpan()))
         elif tag == 'R':
             # Matcher.
             patt = self.nextPatt(stream)
             block = self.nextExpr(stream)
-            self.exprs.append(MastIR.MatcherExpr(patt, block, stream.nextSpan()))
+            self.pushExpr(MastIR.MatcherExpr(patt, block, stream.nextSpan()))
         elif tag == 'A':
             # Assign.
             target = stream.nextStr()
             expr = self.nextExpr(stream)
-            self.exprs.append(MastIR.AssignExpr(target, expr, stream.nextSpan()))
+            self.pushExpr(MastIR.AssignExpr(target, expr, stream.nextSpan()))
         elif tag == 'F':
             # Try/finally.
             tryExpr = self.nextExpr(stream)
             finallyExpr = self.nextExpr(stream)
-            self.exprs.append(MastIR.FinallyExpr(tryExpr, finallyExpr, stream.nextSpan()))
+            self.pushExpr(MastIR.FinallyExpr(tryExpr, finallyExpr, stream.nextSpan()))
         elif tag == 'Y':
             # Try/catch.
             tryExpr = self.nextExpr(stream)
             catchPatt = self.nextPatt(stream)
             catchExpr = self.nextExpr(stream)
-            self.exprs.append(MastIR.TryExpr(tryExpr, catchPatt, catchExpr, stream.nextSpan()))
+            self.pushExpr(MastIR.TryExpr(tryExpr, catchPatt, catchExpr, stream.nextSpan()))
         elif tag == 'H':
             # Hide.
             expr = self.nextExpr(stream)
-            self.exprs.append(MastIR.HideExpr(expr, stream.nextSpan()))
+            self.pushExpr(MastIR.HideExpr(expr, stream.nextSpan()))
         elif tag == 'I':
             # If/then/else.
             cond = self.nextExpr(stream)
             cons = self.nextExpr(stream)
             alt = self.nextExpr(stream)
-            self.exprs.append(MastIR.IfExpr(cond, cons, alt, stream.nextSpan()))
+            self.pushExpr(MastIR.IfExpr(cond, cons, alt, stream.nextSpan()))
         elif tag == 'T':
             # Meta state.
-            self.exprs.append(MastIR.MetaStateExpr(stream.nextSpan()))
+            self.pushExpr(MastIR.MetaStateExpr(stream.nextSpan()))
         elif tag == 'X':
             # Meta context.
-            self.exprs.append(MastIR.MetaContextExpr(stream.nextSpan()))
+            self.pushExpr(MastIR.MetaContextExpr(stream.nextSpan()))
         else:
             raise InvalidMAST("Didn't know tag %s" % tag)
 
         if self.noisy:
-            if self.patts:
-                print "Top pattern:", self.patts[-1]
+            if self.pattCount:
+                print "Top pattern:", self.patts[self.pattCount - 1]
             else:
                 print "No patterns yet"
-            if self.exprs:
-                print "Top expression:", self.exprs[-1]
+            if self.exprCount:
+                print "Top expression:", self.exprs[self.exprCount - 1]
             else:
                 print "No expressions yet"
 
 
+def decodeHeader(stream, context):
+    """
+    Read a version two header.
+    """
+
+    stream.strings = [stream.nextRawStr() for _ in range(stream.nextInt())]
+    exprCount = stream.nextInt()
+    pattCount = stream.nextInt()
+    # Every record takes at least one byte, so larger counts are lies.
+    remaining = len(stream.bytes) - stream.index
+    if exprCount > remaining or pattCount > remaining - exprCount:
+        raise InvalidMAST("Node counts exceed the size of the stream")
+    context.reserve(exprCount, pattCount)
+
+
 def loadMASTBytes(bs, noisy=False):
     # XXX removed in the next commit?
     filename = u"<unknown>"
@@ -376,7 +465,7 @@ def loadMASTBytes(bs, noisy=False):
     bs = bs[1:]
     if version == 0:
         withSpans = False
-    elif version == 1:
+    elif version == 1 or version == 2:
         withSpans = True
     else:
         raise InvalidMAST("Unsupported MAST version '%d'" % version)
@@ -384,15 +473,19 @@ def loadMASTBytes(bs, noisy=False):
     try:
         stream = MASTStream(bs, withSpans, filename)
         context = MASTContext(noisy)
+        if version == 2:
+            decodeHeader(stream, context)
+        exprCount = len(context.exprs)
+        pattCount = len(context.patts)
         while not stream.exhausted():
             context.decodeNextTag(stream)
+        if version == 2 and (context.exprCount != exprCount or
+                             context.pattCount != pattCount):
+            raise InvalidMAST("Node counts don't match the header")
     except MemoryError:
         raise InvalidMAST("Insufficient memory to decode MAST")
 
-    try:
-        return context.exprs[-1]
-    except IndexError:
-        raise InvalidMAST("No expressions in MAST")
+    return context.lastExpr()
 
 
 def loadMASTHandle(handle, noisy=False):
@@ -32,6 +32,89 @@ class RecorderRate(object):
         return percent(self.success, self.total)
 
 
+class Histogram(object):
+    """
+    A histogram of durations.
+
+    Bucket i counts durations of less than 2**i microseconds; the last bucket
+    also counts everything longer.
+    """
+
+    BUCKETS = 32
+
+    count = 0
+    total = 0.0
+    maximum = 0.0
+
+    def __init__(self):
+        self.buckets = [0] * self.BUCKETS
+
+    def observe(self, elapsed):
+        us = int(elapsed * 1000000)
+        bucket = 0
+        while us > 0 and bucket < self.BUCKETS - 1:
+            us >>= 1
+            bucket += 1
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.maximum:
+            self.maximum = elapsed
+
+    def mean(self):
+        if not self.count:
+            return 0.0
+        return self.total / self.count
+
+    def quantile(self, q):
+        """
+        An upper bound, in seconds, for the `q` quantile of durations.
+        """
+
+        if not self.count:
+            return 0.0
+        needed = q * self.count
+        seen = 0
+        for i in range(self.BUCKETS):
+            seen += self.buckets[i]
+            if seen >= needed:
+                return min((1 << i) / 1000000.0, self.maximum)
+        return self.maximum
+
+    def summary(self):
+        return "mean %fs, p50 <%fs, p99 <%fs, max %fs" % (
+            self.mean(), self.quantile(0.5), self.quantile(0.99),
+            self.maximum)
+
+
+class TurnStatistics(object):
+    """
+    Statistics about the turns taken by a single vat.
+    """
+
+    turns = 0
+    queueHighWater = 0
+
+    def __init__(self):
+        # How long each turn took to run.
+        self.turnDurations = Histogram()
+        # How long each message waited between being sent and being
+        # delivered.
+        self.deliveryLatencies = Histogram()
+
+    def observeQueueDepth(self, depth):
+        if depth > self.queueHighWater:
+            self.queueHighWater = depth
+
+    def countTurn(self):
+        self.turns += 1
+
+    def observeTurn(self, sentAt, startedAt, finishedAt):
+        self.countTurn()
+        self.turnDurations.observe(max(finishedAt - startedAt, 0.0))
+        self.deliveryLatencies.observe(max(startedAt - sentAt, 0.0))
+
+
 class RecorderContext(object):
 
     startTime = 0
@@ -55,6 +138,7 @@ class Recorder(object):
         self.timings = {}
         self.rates = {}
         self.contextStack = []
+        self.turnStatistics = []
 
     def start(self):
         self.startTime = time()
@@ -91,6 +175,9 @@ class Recorder(object):
             self.rates[label] = RecorderRate()
         return self.rates[label]
 
+    def addTurnStatistics(self, label, stats):
+        self.turnStatistics.append((label, stats))
+
     def printResults(self):
         total = self.endTime - self.startTime
         debug_print("Total recorded time:", total)
@@ -103,6 +190,16 @@ class Recorder(object):
         for label, rate in self.rates.iteritems():
             debug_print("~", label + ":", rate.rate())
 
+        if self.turnStatistics:
+            debug_print("Recorded vats:")
+        for label, stats in self.turnStatistics:
+            debug_print("~", label + ":", stats.turns, "turns,",
+                        "queue high-water mark", stats.queueHighWater)
+            debug_print("~ ~ Turn durations:",
+                        stats.turnDurations.summary())
+            debug_print("~ ~ Delivery latencies:",
+                        stats.deliveryLatencies.summary())
+
     def context(self, label):
         return RecorderContext(self, label)
 
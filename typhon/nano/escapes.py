@@ -6,8 +6,20 @@ from typhon.nano.scopes import SCOPE_LOCAL, BoundNounsIR
 
 def elideEscapes(ast):
     ast = ElideMethodReturn().visitExpr(ast)
+    ast = LocalizeEjectors().visitExpr(ast)
     return ast
 
+LocalEscapesIR = BoundNounsIR.extend("LocalEscapes", [],
+    {
+        "Expr": {
+            "LocalEscapeOnlyExpr": [("index", None), ("body", "Expr")],
+            "LocalEscapeExpr": [("index", None), ("body", "Expr"),
+                                ("catchPatt", "Patt"), ("catchBody", "Expr")],
+            "LocalEjectExpr": [("index", None), ("value", "Expr")],
+        },
+    }
+)
+
 class FindUsage(BoundNounsIR.selfPass()):
 
     found = False
@@ -85,3 +97,160 @@ class ElideMethodReturn(BoundNounsIR.selfPass()):
                             else:
                                 return seq
         return self.dest.EscapeOnlyExpr(patt, body, span)
+
+def ejectorPatt(patt):
+    """
+    The local index of the ejector bound by a pattern, and the number of
+    .get/0 calls needed to reach the ejector from that local, or (-1, -1)
+    if the pattern is not a simple unguarded name.
+    """
+
+    if isinstance(patt, BoundNounsIR.NounPatt):
+        index, depth, guard = patt.index, 0, patt.guard
+    elif isinstance(patt, BoundNounsIR.FinalSlotPatt):
+        index, depth, guard = patt.index, 1, patt.guard
+    elif isinstance(patt, BoundNounsIR.FinalBindingPatt):
+        index, depth, guard = patt.index, 2, patt.guard
+    else:
+        return -1, -1
+    if not isinstance(guard, BoundNounsIR.NullExpr):
+        return -1, -1
+    return index, depth
+
+def ejectedValue(obj, verb, args, namedArgs, index, depth, span):
+    """
+    If a call directly fires the ejector in local `index`, return the
+    ejected value; otherwise, return None.
+    """
+
+    if verb != u"run" or len(args) > 1 or namedArgs:
+        return None
+    for _ in range(depth):
+        if not (isinstance(obj, BoundNounsIR.CallExpr) and
+                obj.verb == u"get" and
+                len(obj.args) == len(obj.namedArgs) == 0):
+            return None
+        obj = obj.obj
+    if not (isinstance(obj, BoundNounsIR.LocalExpr) and obj.index == index):
+        return None
+    if args:
+        return args[0]
+    return BoundNounsIR.NullExpr(span)
+
+class CountEjections(BoundNounsIR.selfPass()):
+    """
+    Count the uses of an ejector's local, and how many of those uses fire
+    the ejector directly.
+    """
+
+    def __init__(self, index, depth):
+        self.index = index
+        self.depth = depth
+        self.uses = 0
+        self.ejections = 0
+
+    def visitCallExpr(self, obj, verb, args, namedArgs, span):
+        if ejectedValue(obj, verb, args, namedArgs, self.index, self.depth,
+                        span) is not None:
+            # The receiver is the ejector itself; only the argument can
+            # contain further uses.
+            self.uses += 1
+            self.ejections += 1
+            for arg in args:
+                self.visitExpr(arg)
+            return self.dest.CallExpr(obj, verb, args, namedArgs, span)
+        return self.super.visitCallExpr(self, obj, verb, args, namedArgs,
+                                        span)
+
+    def visitLocalExpr(self, name, index, span):
+        if index == self.index:
+            self.uses += 1
+        return self.dest.LocalExpr(name, index, span)
+
+    def visitObjectExpr(self, doc, patt, auditors, methods, matchers, mast,
+                        layout, span):
+        # The pattern and auditors are evaluated in our frame, but methods
+        # and matchers have their own frames, so firing the ejector from
+        # inside them is not a local jump; any capture of the ejector's local
+        # makes it ineligible.
+        self.visitPatt(patt)
+        for auditor in auditors:
+            self.visitExpr(auditor)
+        frameNames = layout.frameNames
+        for name, (position, scope, index, severity) in frameNames.items():
+            if scope is SCOPE_LOCAL and index == self.index:
+                self.uses += 1
+                break
+        return self.dest.ObjectExpr(doc, patt, auditors, methods, matchers,
+                                    mast, layout, span)
+
+class LocalizeEjectors(BoundNounsIR.makePassTo(LocalEscapesIR)):
+    """
+    Turn escape-exprs whose ejectors never escape into local jumps.
+
+    An ejector may be localized when every use of it in its escape's body
+    directly fires it, and it is not captured by any object. Such an escape
+    does not need to allocate or bind an ejector at all.
+    """
+
+    def __init__(self):
+        # Maps local indices of localized ejectors to their get-depths.
+        self.localEjectors = {}
+
+    def localize(self, patt, body):
+        """
+        Rewrite the body of an escape with a localized ejector, returning
+        the ejector's local index and the new body, or -1 and None if the
+        ejector can't be localized.
+        """
+
+        index, depth = ejectorPatt(patt)
+        if index == -1:
+            return -1, None
+        counter = CountEjections(index, depth)
+        counter.visitExpr(body)
+        if counter.uses != counter.ejections:
+            return -1, None
+        self.localEjectors[index] = depth
+        body = self.visitExpr(body)
+        del self.localEjectors[index]
+        return index, body
+
+    def visitCallExpr(self, obj, verb, args, namedArgs, span):
+        for index, depth in self.localEjectors.items():
+            value = ejectedValue(obj, verb, args, namedArgs, index, depth,
+                                 span)
+            if value is not None:
+                return self.dest.LocalEjectExpr(index, self.visitExpr(value),
+                                                span)
+        return self.super.visitCallExpr(self, obj, verb, args, namedArgs,
+                                        span)
+
+    def visitEscapeOnlyExpr(self, patt, body, span):
+        index, localBody = self.localize(patt, body)
+        if index == -1:
+            return self.super.visitEscapeOnlyExpr(self, patt, body, span)
+        return self.dest.LocalEscapeOnlyExpr(index, localBody, span)
+
+    def visitEscapeExpr(self, patt, body, catchPatt, catchBody, span):
+        index, localBody = self.localize(patt, body)
+        if index == -1:
+            return self.super.visitEscapeExpr(self, patt, body, catchPatt,
+                                              catchBody, span)
+        catchPatt = self.visitPatt(catchPatt)
+        catchBody = self.visitExpr(catchBody)
+        return self.dest.LocalEscapeExpr(index, localBody, catchPatt,
+                                         catchBody, span)
+
+    def visitObjectExpr(self, doc, patt, auditors, methods, matchers, mast,
+                        layout, span):
+        patt = self.visitPatt(patt)
+        auditors = [self.visitExpr(auditor) for auditor in auditors]
+        # Local indices inside of methods and matchers refer to other frames.
+        localEjectors = self.localEjectors
+        self.localEjectors = {}
+        methods = [self.visitMethod(method) for method in methods]
+        matchers = [self.visitMatcher(matcher) for matcher in matchers]
+        self.localEjectors = localEjectors
+        return self.dest.ObjectExpr(doc, patt, auditors, methods, matchers,
+                                    mast, layout, span)
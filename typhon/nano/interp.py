@@ -3,10 +3,11 @@ A simple AST interpreter.
 """
 
 from rpython.rlib import rvmprof
-from rpython.rlib.jit import promote, unroll_safe, we_are_jitted
+from rpython.rlib.jit import elidable, promote, unroll_safe
 
 from typhon.atoms import getAtom
-from typhon.errors import Ejecting, Refused, UserException, userError
+from typhon.errors import (Ejecting, LocalEjecting, Refused, UserException,
+                           userError)
 from typhon.nano.main import mainPipeline
 from typhon.nano.mix import StampedScriptIR, mix
 from typhon.nano.scopes import (SCOPE_FRAME, SCOPE_LOCAL,
@@ -19,7 +20,7 @@ from typhon.objects.collections.lists import unwrapList, wrapList
 from typhon.objects.collections.maps import (ConstMap, EMPTY_MAP, monteMap,
                                              unwrapMap)
 from typhon.objects.constants import unwrapBool
-from typhon.objects.data import StrObject, unwrapStr
+from typhon.objects.data import CharObject, IntObject, StrObject, unwrapStr
 from typhon.objects.ejectors import Ejector, theThrower, throw
 from typhon.objects.exceptions import sealException
 from typhon.objects.guards import FinalSlotGuard, VarSlotGuard, anyGuard
@@ -29,6 +30,8 @@ from typhon.objects.slots import (Binding, FinalSlot, VarSlot, finalBinding,
                                   varBinding)
 from typhon.profile import profileTyphon
 
+CALLWITHMESSAGE_2 = getAtom(u"callWithMessage", 2)
+FAIL = StrObject(u"FAIL")
 RUN_2 = getAtom(u"run", 2)
 _UNCALL_0 = getAtom(u"_uncall", 0)
 
@@ -38,6 +41,12 @@ NULL_BINDING = finalBinding(NullObject, anyGuard)
 ProfileNameIR = StampedScriptIR.extend("ProfileName",
     ["ProfileName"],
     {
+        "Script": {
+            "ScriptExpr": [("name", None), ("doc", None), ("mast", None),
+                           ("layout", None), ("stamps", "Object*"),
+                           ("methods", "Method*"),
+                           ("matchers", "Matcher*"), ("methodIndex", None)],
+        },
         "Method": {
             "MethodExpr": [("profileName", "ProfileName"), ("doc", None),
                            ("atom", None), ("patts", "Patt*"),
@@ -46,7 +55,8 @@ ProfileNameIR = StampedScriptIR.extend("ProfileName",
         },
         "Matcher": {
             "MatcherExpr": [("profileName", "ProfileName"), ("patt", "Patt"),
-                            ("body", "Expr"), ("localSize", None)],
+                            ("body", "Expr"), ("localSize", None),
+                            ("forward", None)],
         },
     }
 )
@@ -87,6 +97,21 @@ class MakeProfileNames(StampedScriptIR.makePassTo(ProfileNameIR)):
         name, fqn = self.objectNames[-1]
         return "mt:%s.%s:1:%s" % (name, inner, fqn)
 
+    def visitScriptExpr(self, name, doc, mast, layout, stamps, methods,
+                        matchers, span):
+        stamps = [self.visitObject(stamp) for stamp in stamps]
+        methods = [self.visitMethod(method) for method in methods]
+        matchers = [self.visitMatcher(matcher) for matcher in matchers]
+        # Index the methods by atom, once per script, so that dispatch
+        # doesn't have to scan. The first method for an atom wins, as it
+        # would have during a scan.
+        methodIndex = {}
+        for method in methods:
+            if method.atom not in methodIndex:
+                methodIndex[method.atom] = method
+        return self.dest.ScriptExpr(name, doc, mast, layout, stamps, methods,
+                                    matchers, methodIndex, span)
+
     def visitMethodExpr(self, doc, atom, patts, namedPatts, guard, body,
             localSize, span):
         # NB: `atom.repr` is tempting but wrong. ~ C.
@@ -102,11 +127,42 @@ class MakeProfileNames(StampedScriptIR.makePassTo(ProfileNameIR)):
         rvmprof.register_code(rv, lambda method: method.profileName)
         return rv
 
+    def forwardTarget(self, patt, body):
+        """
+        If a matcher only forwards its message, as in `match message {
+        M.callWithMessage(target, message) }`, return the expression for its
+        target. Otherwise, return None.
+        """
+
+        from typhon.scopes.safe import MObject
+        if not (isinstance(patt, self.dest.NounPatt) and
+                isinstance(patt.guard, self.dest.NullExpr)):
+            return None
+        if isinstance(body, self.dest.SeqExpr) and len(body.exprs) == 1:
+            body = body.exprs[0]
+        if not (isinstance(body, self.dest.CallExpr) and
+                body.atom is CALLWITHMESSAGE_2 and not body.namedArgs):
+            return None
+        if not (isinstance(body.obj, self.dest.LiveExpr) and
+                isinstance(body.obj.obj, MObject)):
+            return None
+        target, message = body.args
+        if not (isinstance(message, self.dest.LocalExpr) and
+                message.index == patt.index):
+            return None
+        # The target must be available before anything is bound.
+        if (isinstance(target, self.dest.FrameExpr) or
+            isinstance(target, self.dest.LiveExpr)):
+            return target
+        return None
+
     def visitMatcherExpr(self, patt, body, localSize, span):
         profileName = self.makeProfileName("matcher")
         patt = self.visitPatt(patt)
         body = self.visitExpr(body)
-        rv = self.dest.MatcherExpr(profileName, patt, body, localSize, span)
+        forward = self.forwardTarget(patt, body)
+        rv = self.dest.MatcherExpr(profileName, patt, body, localSize,
+                                   forward, span)
         rvmprof.register_code(rv, lambda matcher: matcher.profileName)
         return rv
 
@@ -117,6 +173,40 @@ rvmprof.register_code_object_class(ProfileNameIR.MatcherExpr,
         lambda matcher: matcher.profileName)
 
 
+@elidable
+def lookupIntCase(cases, key):
+    return cases.get(key, 0)
+
+@elidable
+def lookupStrCase(cases, key):
+    return cases.get(key, 0)
+
+@elidable
+def lookupCharCase(cases, key):
+    return cases.get(key, 0)
+
+def switchStart(specimen, intCases, strCases, charCases):
+    """
+    The index of the first switch case which could match a specimen.
+    """
+
+    if isinstance(specimen, IntObject):
+        return lookupIntCase(intCases, specimen.getInt())
+    elif isinstance(specimen, StrObject):
+        return lookupStrCase(strCases, specimen._s)
+    elif isinstance(specimen, CharObject):
+        return lookupCharCase(charCases, specimen._c)
+    return 0
+
+@elidable
+def lookupMethod(script, atom):
+    """
+    Find the method on a script which responds to an atom, or None.
+    """
+
+    return script.methodIndex.get(atom, None)
+
+
 class InterpObject(Object):
     """
     An object whose script is executed by the AST evaluator.
@@ -124,9 +214,6 @@ class InterpObject(Object):
 
     _immutable_fields_ = "frame[*]", "script", "report"
 
-    # Inline single-entry method cache.
-    cachedMethod = None, None
-
     # Auditor report.
     report = None
 
@@ -163,22 +250,10 @@ class InterpObject(Object):
         # super().
         return Object.auditedBy(self, prospect)
 
-    @unroll_safe
     def getMethod(self, atom):
-        # If we are JIT'd, then don't bother with the method cache. It will
-        # only slow things down. Instead, head directly to the script and find
-        # the right method.
-        if we_are_jitted():
-            for method in promote(self.script).methods:
-                if method.atom is atom:
-                    return promote(method)
-        else:
-            if self.cachedMethod[0] is atom:
-                return self.cachedMethod[1]
-            for method in self.script.methods:
-                if method.atom is atom:
-                    self.cachedMethod = atom, method
-                    return method
+        # Scripts and atoms are both good candidates for promotion, and the
+        # lookup is pure, so the JIT can fold it away entirely.
+        return lookupMethod(promote(self.script), promote(atom))
 
     def respondingAtoms(self):
         d = {}
@@ -202,15 +277,14 @@ class InterpObject(Object):
         namedArgDict = unwrapMap(namedArgs)
         for np in method.namedPatts:
             k = e.visitExpr(np.key)
-            if isinstance(np.default, ProfileNameIR.NullExpr):
-                if k not in namedArgDict:
+            # One lookup per named pattern; maps never hold None.
+            v = namedArgDict.get(k, None)
+            if v is None:
+                if isinstance(np.default, ProfileNameIR.NullExpr):
                     raise userError(u"Named arg %s missing in call" % (
                         k.toString(),))
-                e.matchBind(np.patt, namedArgDict[k])
-            elif k not in namedArgDict:
-                e.matchBind(np.patt, e.visitExpr(np.default))
-            else:
-                e.matchBind(np.patt, namedArgDict[k])
+                v = e.visitExpr(np.default)
+            e.matchBind(np.patt, v)
         resultGuard = e.visitExpr(method.guard)
         v = e.visitExpr(method.body)
         if resultGuard is NullObject:
@@ -225,6 +299,31 @@ class InterpObject(Object):
         e.matchBind(matcher.patt, message, ej)
         return e.visitExpr(matcher.body)
 
+    def runMatcherParts(self, matcher, atom, args, namedArgs, ej):
+        """
+        Run a matcher whose pattern is `[verb, args, namedArgs]`, binding
+        each part directly instead of building the message first.
+        """
+
+        e = Evaluator(self.frame, matcher.localSize)
+        patt = matcher.patt
+        assert isinstance(patt, ProfileNameIR.ListPatt)
+        patts = patt.patts
+        e.matchBind(patts[0], StrObject(atom.verb), ej)
+        e.matchBind(patts[1], wrapList(args), ej)
+        e.matchBind(patts[2], namedArgs, ej)
+        return e.visitExpr(matcher.body)
+
+    def forwardMatcher(self, matcher, atom, args, namedArgs):
+        """
+        Run a matcher which forwards its message to a target, by passing
+        the message straight along.
+        """
+
+        e = Evaluator(self.frame, matcher.localSize)
+        target = e.visitExpr(matcher.forward)
+        return target.callAtom(atom, args, namedArgs, matcher.span)
+
     def toString(self):
         # Easily the worst part of the entire stringifying experience. We must
         # be careful to not recurse here.
@@ -286,11 +385,22 @@ class InterpObject(Object):
 
     @unroll_safe
     def runMatchers(self, atom, args, namedArgs):
-        message = wrapList([StrObject(atom.verb), wrapList(args),
-                            namedArgs])
+        # The message is only built for matchers which need all of it.
+        message = None
         for matcher in promote(self.script).matchers:
+            if matcher.forward is not None:
+                # Forwarders cannot fail to match.
+                return self.forwardMatcher(matcher, atom, args, namedArgs)
             with Ejector() as ej:
                 try:
+                    patt = matcher.patt
+                    if (isinstance(patt, ProfileNameIR.ListPatt) and
+                        len(patt.patts) == 3):
+                        return self.runMatcherParts(matcher, atom, args,
+                                                    namedArgs, ej)
+                    if message is None:
+                        message = wrapList([StrObject(atom.verb),
+                                            wrapList(args), namedArgs])
                     return self.runMatcher(matcher, message, ej)
                 except Ejecting as e:
                     if e.ejector is ej:
@@ -449,11 +559,28 @@ class Evaluator(ProfileNameIR.makePassTo(None)):
             for na in namedArgs:
                 (k, v) = self.visitNamedArg(na)
                 d[k] = v
+            # Supply the Miranda FAIL here, so that callAtom() doesn't have
+            # to copy the whole map again just to merge it in.
+            if FAIL not in d:
+                d[FAIL] = theThrower
             namedArgMap = ConstMap(d)
         else:
             namedArgMap = EMPTY_MAP
         return rcvr.callAtom(atom, argVals, namedArgMap, span)
 
+    def visitInlinedExpr(self, obj, atom, params, body, span):
+        # jit_debug("InlinedExpr")
+        try:
+            return self.visitExpr(body)
+        except UserException as ue:
+            # Leave the same trail that the call would have left.
+            ue.addTrail(obj, atom, self.inlinedArgs(params), span)
+            raise
+
+    @unroll_safe
+    def inlinedArgs(self, params):
+        return [self.locals[i] for i in params]
+
     def visitDefExpr(self, patt, ex, rvalue, span):
         # jit_debug("DefExpr")
         ex = self.visitExpr(ex)
@@ -486,6 +613,50 @@ class Evaluator(ProfileNameIR.makePassTo(None)):
                 self.matchBind(catchPatt, e.value)
                 return self.visitExpr(catchBody)
 
+    @unroll_safe
+    def visitSwitchExpr(self, specimen, intCases, strCases, charCases,
+                        levels, tail, span):
+        # jit_debug("SwitchExpr")
+        start = switchStart(self.visitExpr(specimen), intCases, strCases,
+                            charCases)
+        # Cases before the start cannot match, and only the tail reads their
+        # catch patterns, so they can be skipped entirely.
+        for i in range(start, len(levels)):
+            level = levels[i]
+            assert isinstance(level, self.src.EscapeExpr)
+            with Ejector() as ej:
+                self.matchBind(level.ejPatt, ej)
+                try:
+                    return self.visitExpr(level.ejBody)
+                except Ejecting as e:
+                    if e.ejector is not ej:
+                        raise
+                    self.matchBind(level.catchPatt, e.value)
+        return self.visitExpr(tail)
+
+    def visitLocalEscapeOnlyExpr(self, index, body, span):
+        # jit_debug("LocalEscapeOnlyExpr")
+        try:
+            return self.visitExpr(body)
+        except LocalEjecting as le:
+            if le.index != index:
+                raise
+            return le.value
+
+    def visitLocalEscapeExpr(self, index, body, catchPatt, catchBody, span):
+        # jit_debug("LocalEscapeExpr")
+        try:
+            return self.visitExpr(body)
+        except LocalEjecting as le:
+            if le.index != index:
+                raise
+            self.matchBind(catchPatt, le.value)
+            return self.visitExpr(catchBody)
+
+    def visitLocalEjectExpr(self, index, value, span):
+        # jit_debug("LocalEjectExpr")
+        raise LocalEjecting(index, self.visitExpr(value))
+
     def visitFinallyExpr(self, body, atLast, span):
         # jit_debug("FinallyExpr")
         try:
@@ -748,10 +919,41 @@ def env2scope(outerNames, env):
     return scope
 
 
-def evalMonte(expr, environment, fqnPrefix, inRepl):
+def scopeKey(names):
+    """
+    A key which is the same for any two scopes with the same names.
+
+    Nouns may contain any character, so each name is prefixed with its
+    length.
+    """
+
+    names = names[:]
+    names.sort()
+    return u"".join([u"%d:%s" % (len(name), name) for name in names])
+
+
+def evalMonte(expr, environment, fqnPrefix, inRepl, pipelineCache=None):
+    """
+    Compile and evaluate some Monte code in an environment.
+
+    If `pipelineCache` is given, then it is a dictionary which memoizes the
+    main nanopass pipeline. That part of compilation depends only upon the
+    names in the environment, not their values, so it need not be redone
+    when the same code is evaluated again in a similar environment.
+    """
+
     # Run the main nanopass pipeline.
-    ast, outerNames, topLocalNames, localSize = mainPipeline(expr,
-            environment.keys(), fqnPrefix, inRepl)
+    names = environment.keys()
+    if pipelineCache is None:
+        pipelined = mainPipeline(expr, names, fqnPrefix, inRepl)
+    else:
+        key = scopeKey(names)
+        if key in pipelineCache:
+            pipelined = pipelineCache[key]
+        else:
+            pipelined = mainPipeline(expr, names, fqnPrefix, inRepl)
+            pipelineCache[key] = pipelined
+    ast, outerNames, topLocalNames, localSize = pipelined
 
     outers = env2scope(outerNames, environment)
     ast = mix(ast, outers)
@@ -10,19 +10,27 @@ The separation allows us to make the first part short and sweet.
 
 from collections import OrderedDict
 
+from typhon.atoms import getAtom
 from typhon.errors import Ejecting, UserException
-from typhon.nano.scopes import SEV_BINDING, SEV_NOUN, SEV_SLOT
+from typhon.nano.scopes import SCOPE_LOCAL, SEV_BINDING, SEV_NOUN, SEV_SLOT
 from typhon.nano.structure import AtomIR
 from typhon.objects.auditors import deepFrozenGuard
-from typhon.objects.data import (BigInt, CharObject, DoubleObject, IntObject,
-                                 StrObject)
+from typhon.objects.constants import FalseObject, TrueObject
+from typhon.objects.data import (BigInt, BytesObject, CharObject,
+                                 DoubleObject, IntObject, StrObject)
 from typhon.objects.ejectors import Ejector
-from typhon.objects.guards import FinalSlotGuard, VarSlotGuard, anyGuard
+from typhon.objects.guards import (BoolGuard, BytesGuard, CharGuard,
+                                   DoubleGuard, FinalSlotGuard, IntGuard,
+                                   StrGuard, VarSlotGuard, anyGuard)
 from typhon.objects.user import Audition
 from typhon.objects.slots import Binding, FinalSlot, VarSlot
 
 from typhon.nano.mast import BuildKernelNodes
 from typhon.objects.user import AuditClipboard
+from typhon.prelude import getGlobalValue
+
+PICK_2 = getAtom(u"pick", 2)
+RUN_1 = getAtom(u"run", 1)
 
 
 def mix(ast, outers):
@@ -31,6 +39,7 @@ def mix(ast, outers):
     ast = SpecializeCalls().visitExpr(ast)
     ast = SplitAuditors().visitExpr(ast)
     ast = DischargeAuditors().visitExpr(ast)
+    ast = ElideGuards().visitExpr(ast)
     return ast
 
 NoOutersIR = AtomIR.extend("NoOuters",
@@ -125,6 +134,11 @@ MixIR = NoLiteralsIR.extend("Mix",
     {
         "Expr": {
             "ExceptionExpr": [("exception", "Exception")],
+            "SwitchExpr": [("specimen", "Expr"), ("intCases", None),
+                           ("strCases", None), ("charCases", None),
+                           ("levels", "Expr*"), ("tail", "Expr")],
+            "InlinedExpr": [("obj", None), ("atom", None), ("params", None),
+                            ("body", "Expr")],
         }
     }
 )
@@ -141,8 +155,95 @@ def isDeepFrozen(obj):
                 raise
     return False
 
+def isInert(expr):
+    """
+    Whether evaluating an expression can have no effects.
+    """
+
+    return (isinstance(expr, MixIR.LiveExpr) or
+            isinstance(expr, MixIR.NullExpr) or
+            isinstance(expr, MixIR.LocalExpr) or
+            isinstance(expr, MixIR.FrameExpr))
+
+def pureAtoms(obj):
+    """
+    The atoms of the pure methods of a live builtin object.
+    """
+
+    if isinstance(obj, IntObject):
+        return IntObject._pureAtoms_
+    elif isinstance(obj, BigInt):
+        return BigInt._pureAtoms_
+    elif isinstance(obj, DoubleObject):
+        return DoubleObject._pureAtoms_
+    elif isinstance(obj, StrObject):
+        return StrObject._pureAtoms_
+    elif isinstance(obj, CharObject):
+        return CharObject._pureAtoms_
+    elif isinstance(obj, BytesObject):
+        return BytesObject._pureAtoms_
+    elif obj is TrueObject:
+        return TrueObject._pureAtoms_
+    elif obj is FalseObject:
+        return FalseObject._pureAtoms_
+    return {}
+
+# The most nodes that an inlined method body may have.
+INLINE_LIMIT = 16
+
+class CannotInline(Exception):
+    pass
+
+class FindLocals(NoLiteralsIR.selfPass()):
+    """
+    Find whether an expression uses any of a set of locals, either directly
+    or by closing over them in an object's frame.
+    """
+
+    found = False
+
+    def __init__(self, indices):
+        self.indices = indices
+
+    def visitLocalExpr(self, name, index, span):
+        if index in self.indices:
+            self.found = True
+        return self.dest.LocalExpr(name, index, span)
+
+    def visitObjectExpr(self, patt, guards, auditors, script, span):
+        # The object's own methods have their own locals; only its frame can
+        # refer to ours.
+        frameNames = script.layout.frameNames
+        for name, (position, scope, index, severity) in frameNames.items():
+            if scope is SCOPE_LOCAL and index in self.indices:
+                self.found = True
+                break
+        patt = self.visitPatt(patt)
+        auditors = [self.visitExpr(auditor) for auditor in auditors]
+        return self.dest.ObjectExpr(patt, guards, auditors, script, span)
+
+def usesLocals(expr, indices):
+    finder = FindLocals(indices)
+    finder.visitExpr(expr)
+    return finder.found
+
+def plainLocal(patt):
+    """
+    The local index bound by an unguarded name pattern, or -1.
+    """
+
+    if (isinstance(patt, NoLiteralsIR.NounPatt) and
+            isinstance(patt.guard, NoLiteralsIR.NullExpr)):
+        return patt.index
+    return -1
+
 class SpecializeCalls(NoLiteralsIR.makePassTo(MixIR)):
 
+    def __init__(self):
+        # The local sizes of the methods and matchers being visited, so that
+        # inlined code can be given locals of its own.
+        self.localSizes = []
+
     def enliven(self, expr):
         """
         If `expr` is live and DeepFrozen or thawable, return the live object.
@@ -169,10 +270,46 @@ class SpecializeCalls(NoLiteralsIR.makePassTo(MixIR)):
                 return obj
         return None
 
+    def foldPure(self, obj, atom, args, span):
+        """
+        Run a pure builtin method on literal arguments, or pick between
+        inert arguments with a literal Bool.
+
+        Returns None if the call can't be folded.
+        """
+
+        if atom is PICK_2 and (obj is TrueObject or obj is FalseObject):
+            if isInert(args[0]) and isInert(args[1]):
+                return args[0] if obj is TrueObject else args[1]
+            return None
+        if atom not in pureAtoms(obj):
+            return None
+        liveArgs = []
+        for arg in args:
+            if not isinstance(arg, self.dest.LiveExpr):
+                return None
+            # Pure methods only promise to not change their arguments, so
+            # the arguments must not be able to change either.
+            if liveType(arg.obj) is None and not isDeepFrozen(arg.obj):
+                return None
+            liveArgs.append(arg.obj)
+        try:
+            result = obj.callAtom(atom, liveArgs, None, span)
+            return self.dest.LiveExpr(result, span)
+        except UserException as ue:
+            return self.dest.ExceptionExpr(ue, span)
+
     def visitCallExpr(self, obj, atom, args, namedArgs, span):
         obj = self.visitExpr(obj)
         args = [self.visitExpr(arg) for arg in args]
         namedArgs = [self.visitNamedArg(namedArg) for namedArg in namedArgs]
+        if isinstance(obj, self.dest.LiveExpr) and liveType(obj.obj):
+            # Builtin data is only folded through its pure methods.
+            if not namedArgs:
+                folded = self.foldPure(obj.obj, atom, args, span)
+                if folded is not None:
+                    return folded
+            return self.dest.CallExpr(obj, atom, args, namedArgs, span)
         liveObj = self.enliven(obj)
         if liveObj is not None:
             liveArgs = [self.enliven(arg) for arg in args]
@@ -187,8 +324,297 @@ class SpecializeCalls(NoLiteralsIR.makePassTo(MixIR)):
                         # print "Not DF:", str(result)[:50]
                     except UserException as ue:
                         return self.dest.ExceptionExpr(ue, span)
+            if not namedArgs and self.localSizes:
+                inlined = self.inlineCall(liveObj, atom, args, span)
+                if inlined is not None:
+                    return inlined
         return self.dest.CallExpr(obj, atom, args, namedArgs, span)
 
+    def visitIfExpr(self, test, cons, alt, span):
+        test = self.visitExpr(test)
+        # Prune branches which can't be taken.
+        if isinstance(test, self.dest.LiveExpr):
+            if test.obj is TrueObject:
+                return self.visitExpr(cons)
+            elif test.obj is FalseObject:
+                return self.visitExpr(alt)
+        return self.dest.IfExpr(test, self.visitExpr(cons),
+                                self.visitExpr(alt), span)
+
+    def visitSeqExpr(self, exprs, span):
+        # Flatten nested sequences, and drop inert expressions whose values
+        # are discarded.
+        flattened = []
+        for expr in exprs:
+            expr = self.visitExpr(expr)
+            if isinstance(expr, self.dest.SeqExpr):
+                flattened.extend(expr.exprs)
+            else:
+                flattened.append(expr)
+        kept = [expr for expr in flattened[:-1] if not isInert(expr)]
+        if flattened:
+            kept.append(flattened[-1])
+        if len(kept) == 1:
+            return kept[0]
+        return self.dest.SeqExpr(kept, span)
+
+    def inlineCall(self, target, atom, args, span):
+        """
+        Splice the body of a small method of a DeepFrozen interpreted object
+        into the current method, in place of a call to it.
+
+        The arguments are bound to fresh locals, the method's own locals are
+        moved past the current method's locals, and frame accesses become
+        live objects, since a DeepFrozen frame cannot change.
+
+        Returns None if the call can't be inlined.
+        """
+
+        from typhon.nano.interp import InterpObject, ProfileNameIR as ir
+        if not isinstance(target, InterpObject) or target.script.matchers:
+            return None
+        method = target.getMethod(atom)
+        if method is None or method.namedPatts:
+            return None
+        base = self.localSizes[-1]
+        size = base + method.localSize
+        self.inlineBudget = INLINE_LIMIT
+        try:
+            # All of the arguments are evaluated before any parameter guards
+            # run, as they would be for a call.
+            exprs = []
+            coercions = []
+            params = []
+            for i, patt in enumerate(method.patts):
+                if not isinstance(patt, ir.NounPatt):
+                    raise CannotInline()
+                index = base + patt.index
+                params.append(index)
+                exprs.append(self.dest.DefExpr(
+                    self.dest.NounPatt(patt.name, self.dest.NullExpr(span),
+                                       index, patt.span),
+                    self.dest.NullExpr(span), args[i], span))
+                guard = self.inlined(patt.guard, base, target)
+                if not isinstance(guard, self.dest.NullExpr):
+                    coercions.append(self.dest.DefExpr(
+                        self.dest.NounPatt(patt.name, guard, index,
+                                           patt.span),
+                        self.dest.NullExpr(span),
+                        self.dest.LocalExpr(patt.name, index, span), span))
+            body = self.inlined(method.body, base, target)
+            guard = self.inlined(method.guard, base, target)
+        except CannotInline:
+            return None
+        if not isinstance(guard, self.dest.NullExpr):
+            # Coerce the result, just as the method would have.
+            patt = self.dest.NounPatt(u"$return", guard, size, span)
+            coercions.append(self.dest.DefExpr(patt, self.dest.NullExpr(span),
+                                               body, span))
+            body = self.dest.LocalExpr(u"$return", size, span)
+            size += 1
+        if coercions:
+            body = self.dest.SeqExpr(coercions + [body], span)
+        self.localSizes[-1] = size
+        # Errors from the body still get a trail frame for the call.
+        exprs.append(self.dest.InlinedExpr(target, atom, params, body, span))
+        return self.dest.SeqExpr(exprs, span)
+
+    def inlined(self, expr, base, target):
+        """
+        Copy an expression from an inlined method body into this IR.
+
+        Raises CannotInline if the expression is too big or does anything
+        more complex than calling, sequencing, and defining nouns.
+        """
+
+        from typhon.nano.interp import ProfileNameIR as ir
+        self.inlineBudget -= 1
+        if self.inlineBudget < 0:
+            raise CannotInline()
+        if isinstance(expr, ir.NullExpr):
+            return self.dest.NullExpr(expr.span)
+        elif isinstance(expr, ir.LiveExpr):
+            return self.dest.LiveExpr(expr.obj, expr.span)
+        elif isinstance(expr, ir.LocalExpr):
+            return self.dest.LocalExpr(expr.name, base + expr.index,
+                                       expr.span)
+        elif isinstance(expr, ir.FrameExpr):
+            return self.dest.LiveExpr(target.frame[expr.index], expr.span)
+        elif isinstance(expr, ir.CallExpr):
+            if expr.namedArgs:
+                raise CannotInline()
+            return self.dest.CallExpr(self.inlined(expr.obj, base, target),
+                                      expr.atom,
+                                      [self.inlined(arg, base, target)
+                                       for arg in expr.args],
+                                      [], expr.span)
+        elif isinstance(expr, ir.SeqExpr):
+            return self.dest.SeqExpr([self.inlined(e, base, target)
+                                      for e in expr.exprs], expr.span)
+        elif isinstance(expr, ir.IfExpr):
+            return self.dest.IfExpr(self.inlined(expr.test, base, target),
+                                    self.inlined(expr.cons, base, target),
+                                    self.inlined(expr.alt, base, target),
+                                    expr.span)
+        elif isinstance(expr, ir.DefExpr):
+            patt = expr.patt
+            if not isinstance(patt, ir.NounPatt):
+                raise CannotInline()
+            patt = self.dest.NounPatt(patt.name,
+                                      self.inlined(patt.guard, base, target),
+                                      base + patt.index, patt.span)
+            return self.dest.DefExpr(patt,
+                                     self.inlined(expr.ex, base, target),
+                                     self.inlined(expr.rvalue, base, target),
+                                     expr.span)
+        raise CannotInline()
+
+    def visitMethodExpr(self, doc, atom, patts, namedPatts, guard, body,
+                        localSize, span):
+        self.localSizes.append(localSize)
+        patts = [self.visitPatt(patt) for patt in patts]
+        namedPatts = [self.visitNamedPatt(namedPatt)
+                      for namedPatt in namedPatts]
+        guard = self.visitExpr(guard)
+        body = self.visitExpr(body)
+        localSize = self.localSizes.pop()
+        return self.dest.MethodExpr(doc, atom, patts, namedPatts, guard, body,
+                                    localSize, span)
+
+    def visitMatcherExpr(self, patt, body, localSize, span):
+        self.localSizes.append(localSize)
+        patt = self.visitPatt(patt)
+        body = self.visitExpr(body)
+        localSize = self.localSizes.pop()
+        return self.dest.MatcherExpr(patt, body, localSize, span)
+
+    def sameCase(self, expr, index):
+        """
+        If `expr` is the escape-expr for a `match ==value` case of a switch,
+        with an Int, Str, or Char literal value, return the value.
+        Otherwise, return None.
+
+        `index` is the local index of the switch's specimen, or -1 to accept
+        any local as the specimen.
+
+        The case must only fail by its own ejector, fired by the failing
+        definition, and its failure must be caught by a plain local.
+        """
+
+        if not isinstance(expr, self.src.EscapeExpr):
+            return None
+        ejIndex = plainLocal(expr.ejPatt)
+        if ejIndex == -1:
+            return None
+        catchPatt = expr.catchPatt
+        if not (plainLocal(catchPatt) != -1 or
+                (isinstance(catchPatt, self.src.IgnorePatt) and
+                 isinstance(catchPatt.guard, self.src.NullExpr))):
+            return None
+        body = expr.ejBody
+        if not (isinstance(body, self.src.SeqExpr) and len(body.exprs) == 2):
+            return None
+        defExpr = body.exprs[0]
+        if not isinstance(defExpr, self.src.DefExpr):
+            return None
+        ex = defExpr.ex
+        if not (isinstance(ex, self.src.LocalExpr) and ex.index == ejIndex):
+            return None
+        if usesLocals(body.exprs[1], {ejIndex: None}):
+            return None
+        rvalue = defExpr.rvalue
+        if not isinstance(rvalue, self.src.LocalExpr):
+            return None
+        if index != -1 and rvalue.index != index:
+            return None
+        patt = defExpr.patt
+        if not (isinstance(patt, self.src.ViaPatt) and
+                isinstance(patt.patt, self.src.IgnorePatt) and
+                isinstance(patt.patt.guard, self.src.NullExpr)):
+            return None
+        trans = patt.trans
+        if not (isinstance(trans, self.src.CallExpr) and
+                trans.atom is RUN_1 and not trans.namedArgs):
+            return None
+        matchSame = getGlobalValue(u"_matchSame")
+        if matchSame is None:
+            return None
+        receiver = self.visitExpr(trans.obj)
+        if not (isinstance(receiver, self.dest.LiveExpr) and
+                receiver.obj is matchSame):
+            return None
+        value = self.visitExpr(trans.args[0])
+        if not isinstance(value, self.dest.LiveExpr):
+            return None
+        obj = value.obj
+        if (isinstance(obj, IntObject) or isinstance(obj, StrObject) or
+            isinstance(obj, CharObject)):
+            return obj
+        return None
+
+    def visitEscapeExpr(self, ejPatt, ejBody, catchPatt, catchBody, span):
+        """
+        Compile switch-exprs into jump tables.
+
+        A switch-expr expands into a chain of escape-exprs, one per case,
+        with each case's failure handled by the next. When a run of cases
+        starting at the top of the chain are all `match ==value` cases on
+        literals, a table maps each value to the first case which it could
+        satisfy, and evaluation can start at that case instead of trying
+        every case before it.
+
+        Skipped cases never bind their failures, so the run stops at any case
+        which reads the failure of an earlier case; only the tail may read
+        them, and the tail is only reached after trying every case.
+        """
+
+        expr = self.src.EscapeExpr(ejPatt, ejBody, catchPatt, catchBody,
+                                   span)
+        first = self.sameCase(expr, -1)
+        if first is None:
+            return self.super.visitEscapeExpr(self, ejPatt, ejBody, catchPatt,
+                                              catchBody, span)
+        specimen = expr.ejBody.exprs[0].rvalue
+        assert isinstance(specimen, self.src.LocalExpr)
+
+        intCases = {}
+        strCases = {}
+        charCases = {}
+        levels = []
+        failures = {}
+        while True:
+            value = self.sameCase(expr, specimen.index)
+            if value is None:
+                break
+            assert isinstance(expr, self.src.EscapeExpr)
+            if failures and usesLocals(expr.ejBody, failures):
+                break
+            failure = plainLocal(expr.catchPatt)
+            if failure != -1:
+                failures[failure] = None
+            # Earlier cases win, as they would in the chain.
+            i = len(levels)
+            if isinstance(value, IntObject):
+                intCases.setdefault(value.getInt(), i)
+            elif isinstance(value, StrObject):
+                strCases.setdefault(value._s, i)
+            elif isinstance(value, CharObject):
+                charCases.setdefault(value._c, i)
+            levels.append(self.dest.EscapeExpr(self.visitPatt(expr.ejPatt),
+                                               self.visitExpr(expr.ejBody),
+                                               self.visitPatt(expr.catchPatt),
+                                               self.dest.NullExpr(expr.span),
+                                               expr.span))
+            expr = expr.catchBody
+
+        if len(levels) < 2:
+            # Not worth a table.
+            return self.super.visitEscapeExpr(self, ejPatt, ejBody, catchPatt,
+                                              catchBody, span)
+        return self.dest.SwitchExpr(self.visitExpr(specimen), intCases,
+                                    strCases, charCases, levels,
+                                    self.visitExpr(expr), span)
+
 
 SplitAuditorsIR = MixIR.extend(
     "SplitAuditors",
@@ -304,3 +730,209 @@ class DischargeAuditors(SplitAuditorsIR.makePassTo(StampedScriptIR)):
             self.clearRate.no()
             return self.dest.ObjectExpr(patt, guards, auditors, script,
                                         clipboard, span)
+
+
+# Static types are named after the builtin guards which admit them. Each
+# guard's coercion is the identity on specimens of its type.
+
+def guardType(expr):
+    """
+    The static type admitted by a live builtin guard, or None.
+    """
+
+    if isinstance(expr, StampedScriptIR.LiveExpr):
+        guard = expr.obj
+        if isinstance(guard, IntGuard):
+            return "Int"
+        elif isinstance(guard, DoubleGuard):
+            return "Double"
+        elif isinstance(guard, StrGuard):
+            return "Str"
+        elif isinstance(guard, CharGuard):
+            return "Char"
+        elif isinstance(guard, BoolGuard):
+            return "Bool"
+        elif isinstance(guard, BytesGuard):
+            return "Bytes"
+    return None
+
+def liveType(obj):
+    """
+    The static type of a live object, or None.
+    """
+
+    if isinstance(obj, IntObject) or isinstance(obj, BigInt):
+        return "Int"
+    elif isinstance(obj, DoubleObject):
+        return "Double"
+    elif isinstance(obj, StrObject):
+        return "Str"
+    elif isinstance(obj, CharObject):
+        return "Char"
+    elif obj is TrueObject or obj is FalseObject:
+        return "Bool"
+    elif isinstance(obj, BytesObject):
+        return "Bytes"
+    return None
+
+def buildResultTypes():
+    """
+    Map pairs of static types and atoms to the static types of results, for
+    those builtin methods whose AutoHelp return types agree for every class
+    of the receiver's type.
+
+    NOT_RPYTHON
+    """
+
+    typeClasses = [
+        ("Int", [IntObject, BigInt]),
+        ("Double", [DoubleObject]),
+        ("Str", [StrObject]),
+        ("Char", [CharObject]),
+        ("Bytes", [BytesObject]),
+    ]
+    # AutoHelp wrapper names; BigInts are Ints, too.
+    wrapperTypes = {
+        "BigInt": "Int",
+        "Bool": "Bool",
+        "Bytes": "Bytes",
+        "Char": "Char",
+        "Double": "Double",
+        "Int": "Int",
+        "Str": "Str",
+    }
+    resultTypes = {}
+    for ty, classes in typeClasses:
+        first = classes[0]._returnTypes_
+        for atom, rv in first.iteritems():
+            resultType = wrapperTypes.get(rv)
+            for cls in classes[1:]:
+                other = wrapperTypes.get(cls._returnTypes_.get(atom))
+                if other != resultType:
+                    resultType = None
+            if resultType is not None:
+                resultTypes[ty, atom] = resultType
+    return resultTypes
+
+resultTypes = buildResultTypes()
+
+class ElideGuards(StampedScriptIR.selfPass()):
+    """
+    Remove coercions by builtin guards which cannot fail.
+
+    Literals and the results of builtin methods have statically known types,
+    and so do final nouns which are bound to them or guarded by builtin
+    guards. A guard on a final noun or a method's return value is dropped
+    when the guarded value is already known to pass it unchanged.
+    """
+
+    def __init__(self):
+        from typhon.metrics import globalRecorder
+        recorder = globalRecorder()
+        self.elidedRate = recorder.getRateFor("ElideGuards elided")
+        # Local indices of final nouns to their static types. Locals are
+        # only bound by patterns, and an index is not reused while its noun
+        # is in scope, so visiting in evaluation order keeps this sound.
+        self.localTypes = {}
+
+    def typeOf(self, expr):
+        if isinstance(expr, self.dest.LiveExpr):
+            return liveType(expr.obj)
+        elif isinstance(expr, self.dest.LocalExpr):
+            return self.localTypes.get(expr.index, None)
+        elif isinstance(expr, self.dest.CallExpr):
+            if expr.namedArgs:
+                return None
+            receiverType = self.typeOf(expr.obj)
+            if receiverType is None:
+                return None
+            return resultTypes.get((receiverType, expr.atom), None)
+        elif isinstance(expr, self.dest.SeqExpr) and expr.exprs:
+            return self.typeOf(expr.exprs[-1])
+        return None
+
+    def setLocalType(self, index, ty):
+        if ty is None:
+            self.localTypes.pop(index, None)
+        else:
+            self.localTypes[index] = ty
+
+    def elide(self, guard, ty):
+        """
+        Return NullExpr if `guard` certainly passes values of type `ty`
+        unchanged, or `guard` otherwise.
+        """
+
+        if isinstance(guard, self.dest.NullExpr):
+            return guard
+        guardTy = guardType(guard)
+        if guardTy is not None and guardTy == ty:
+            self.elidedRate.yes()
+            return self.dest.NullExpr(guard.span)
+        self.elidedRate.no()
+        return guard
+
+    def visitDefExpr(self, patt, ex, rvalue, span):
+        ex = self.visitExpr(ex)
+        rvalue = self.visitExpr(rvalue)
+        if isinstance(patt, self.src.NounPatt):
+            guard = self.visitExpr(patt.guard)
+            ty = self.typeOf(rvalue)
+            if not isinstance(guard, self.dest.NullExpr):
+                guardTy = guardType(guard)
+                guard = self.elide(guard, ty)
+                ty = guardTy
+            self.setLocalType(patt.index, ty)
+            patt = self.dest.NounPatt(patt.name, guard, patt.index,
+                                      patt.span)
+        else:
+            patt = self.visitPatt(patt)
+        return self.dest.DefExpr(patt, ex, rvalue, span)
+
+    def visitNounPatt(self, name, guard, index, span):
+        guard = self.visitExpr(guard)
+        self.setLocalType(index, guardType(guard))
+        return self.dest.NounPatt(name, guard, index, span)
+
+    def visitFinalSlotPatt(self, name, guard, index, span):
+        self.localTypes.pop(index, None)
+        return self.super.visitFinalSlotPatt(self, name, guard, index, span)
+
+    def visitVarSlotPatt(self, name, guard, index, span):
+        self.localTypes.pop(index, None)
+        return self.super.visitVarSlotPatt(self, name, guard, index, span)
+
+    def visitFinalBindingPatt(self, name, guard, index, span):
+        self.localTypes.pop(index, None)
+        return self.super.visitFinalBindingPatt(self, name, guard, index,
+                                                span)
+
+    def visitVarBindingPatt(self, name, guard, index, span):
+        self.localTypes.pop(index, None)
+        return self.super.visitVarBindingPatt(self, name, guard, index, span)
+
+    def visitBindingPatt(self, name, index, span):
+        self.localTypes.pop(index, None)
+        return self.super.visitBindingPatt(self, name, index, span)
+
+    def visitMethodExpr(self, doc, atom, patts, namedPatts, guard, body,
+                        localSize, span):
+        # Methods have their own frames.
+        localTypes = self.localTypes
+        self.localTypes = {}
+        patts = [self.visitPatt(patt) for patt in patts]
+        namedPatts = [self.visitNamedPatt(namedPatt)
+                      for namedPatt in namedPatts]
+        guard = self.visitExpr(guard)
+        body = self.visitExpr(body)
+        guard = self.elide(guard, self.typeOf(body))
+        self.localTypes = localTypes
+        return self.dest.MethodExpr(doc, atom, patts, namedPatts, guard, body,
+                                    localSize, span)
+
+    def visitMatcherExpr(self, patt, body, localSize, span):
+        localTypes = self.localTypes
+        self.localTypes = {}
+        rv = self.super.visitMatcherExpr(self, patt, body, localSize, span)
+        self.localTypes = localTypes
+        return rv
@@ -7,7 +7,7 @@ Structural refactoring to improve the efficiency of the AST interpreter.
 from rpython.rlib.rbigint import BASE10
 
 from typhon.atoms import getAtom
-from typhon.nano.scopes import BoundNounsIR
+from typhon.nano.escapes import LocalEscapesIR
 from typhon.quoting import quoteChar, quoteStr
 
 def refactorStructure(ast):
@@ -16,7 +16,7 @@ def refactorStructure(ast):
     ast = MakeAtoms().visitExpr(ast)
     return ast
 
-class RemoveDefIgnore(BoundNounsIR.selfPass()):
+class RemoveDefIgnore(LocalEscapesIR.selfPass()):
     """
     match m`def _ :@guard exit @ex := @rvalue`:
         if (guard == NullExpr):
@@ -35,7 +35,7 @@ class RemoveDefIgnore(BoundNounsIR.selfPass()):
                                           span)
         return self.super.visitDefExpr(self, patt, ex, rvalue, span)
 
-SplitScriptIR = BoundNounsIR.extend("SplitScript", [],
+SplitScriptIR = LocalEscapesIR.extend("SplitScript", [],
     {
         "Expr": {
             "ObjectExpr": [("patt", "Patt"), ("auditors", "Expr*"),
@@ -49,7 +49,7 @@ SplitScriptIR = BoundNounsIR.extend("SplitScript", [],
     }
 )
 
-class SplitScript(BoundNounsIR.makePassTo(SplitScriptIR)):
+class SplitScript(LocalEscapesIR.makePassTo(SplitScriptIR)):
 
     def nameForPatt(self, patt):
         if isinstance(patt, self.dest.IgnorePatt):
@@ -213,6 +213,25 @@ class PrettySpecialNouns(AtomIR.makePassTo(None)):
         with self.braces():
             self.visitExpr(catchBody)
 
+    def visitLocalEscapeOnlyExpr(self, index, body, span):
+        self.write(u"escape ⒧" + asIndex(index))
+        with self.braces():
+            self.visitExpr(body)
+
+    def visitLocalEscapeExpr(self, index, body, catchPatt, catchBody, span):
+        self.write(u"escape ⒧" + asIndex(index))
+        with self.braces():
+            self.visitExpr(body)
+        self.write(u" catch ")
+        self.visitPatt(catchPatt)
+        with self.braces():
+            self.visitExpr(catchBody)
+
+    def visitLocalEjectExpr(self, index, value, span):
+        self.write(u"eject ⒧" + asIndex(index) + u"(")
+        self.visitExpr(value)
+        self.write(u")")
+
     def visitFinallyExpr(self, body, atLast, span):
         self.write(u"try")
         with self.braces():
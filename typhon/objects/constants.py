@@ -48,7 +48,7 @@ class _TrueObject(Object):
     def optInterface(self):
         return getGlobalValue(u"Bool")
 
-    @method("Bool", "Bool", _verb="and")
+    @method("Bool", "Bool", _verb="and", _pure=True)
     def _and(self, other):
         """
         Logical conjunction; p ∧ q.
@@ -56,7 +56,7 @@ class _TrueObject(Object):
 
         return other
 
-    @method("Bool", "Bool")
+    @method("Bool", "Bool", _pure=True)
     def butNot(self, other):
         """
         Material nonimplication; p ↛ q.
@@ -64,7 +64,7 @@ class _TrueObject(Object):
 
         return not other
 
-    @method("Bool", _verb="not")
+    @method("Bool", _verb="not", _pure=True)
     def _not(self):
         """
         Negation; ¬p.
@@ -72,7 +72,7 @@ class _TrueObject(Object):
 
         return False
 
-    @method("Int", "Bool")
+    @method("Int", "Bool", _pure=True)
     def op__cmp(self, other):
         """
         Logical bicondition; p ↔ q.
@@ -80,7 +80,7 @@ class _TrueObject(Object):
 
         return True - other
 
-    @method("Bool", "Bool", _verb="or")
+    @method("Bool", "Bool", _verb="or", _pure=True)
     def _or(self, _):
         """
         Logical disjunction; p ∨ q.
@@ -88,7 +88,7 @@ class _TrueObject(Object):
 
         return True
 
-    @method("Any", "Any", "Any")
+    @method("Any", "Any", "Any", _pure=True)
     def pick(self, left, _):
         """
         Choose between two options based on this object's truth value.
@@ -96,7 +96,7 @@ class _TrueObject(Object):
 
         return left
 
-    @method("Bool", "Bool")
+    @method("Bool", "Bool", _pure=True)
     def xor(self, other):
         """
         Exclusive disjunction; p ↮ q.
@@ -123,31 +123,31 @@ class _FalseObject(Object):
     def optInterface(self):
         return getGlobalValue(u"Bool")
 
-    @method("Bool", "Bool", _verb="and")
+    @method("Bool", "Bool", _verb="and", _pure=True)
     def _and(self, _):
         return False
 
-    @method("Bool", "Bool")
+    @method("Bool", "Bool", _pure=True)
     def butNot(self, _):
         return False
 
-    @method("Bool", _verb="not")
+    @method("Bool", _verb="not", _pure=True)
     def _not(self):
         return True
 
-    @method("Int", "Bool")
+    @method("Int", "Bool", _pure=True)
     def op__cmp(self, other):
         return False - other
 
-    @method("Bool", "Bool", _verb="or")
+    @method("Bool", "Bool", _verb="or", _pure=True)
     def _or(self, other):
         return other
 
-    @method("Any", "Any", "Any")
+    @method("Any", "Any", "Any", _pure=True)
     def pick(self, _, right):
         return right
 
-    @method("Bool", "Bool")
+    @method("Bool", "Bool", _pure=True)
     def xor(self, other):
         return other
 
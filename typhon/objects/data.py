@@ -87,7 +87,7 @@ class CharObject(Object):
     def optInterface(self):
         return getGlobalValue(u"Char")
 
-    @method("Char", "Int")
+    @method("Char", "Int", _pure=True)
     def add(self, other):
         """
         Add to this object's code point, producing another character.
@@ -97,7 +97,7 @@ class CharObject(Object):
 
         return self.withOffset(other)
 
-    @method("Int")
+    @method("Int", _pure=True)
     def asInteger(self):
         """
         The code point for this object.
@@ -107,11 +107,11 @@ class CharObject(Object):
 
         return ord(self._c)
 
-    @method("Str")
+    @method("Str", _pure=True)
     def asString(self):
         return unicode(self._c)
 
-    @method("Str")
+    @method("Str", _pure=True)
     def getCategory(self):
         """
         The Unicode category of this object's code point.
@@ -119,7 +119,7 @@ class CharObject(Object):
 
         return unicode(unicodedb.category(ord(self._c)))
 
-    @method("Char", "Char")
+    @method("Char", "Char", _pure=True)
     def max(self, other):
         """
         The greater code point of two characters.
@@ -127,7 +127,7 @@ class CharObject(Object):
 
         return max(self._c, other)
 
-    @method("Char", "Char")
+    @method("Char", "Char", _pure=True)
     def min(self, other):
         """
         The lesser code point of two characters.
@@ -135,7 +135,7 @@ class CharObject(Object):
 
         return min(self._c, other)
 
-    @method("Char")
+    @method("Char", _pure=True)
     def next(self):
         """
         The next code point.
@@ -145,7 +145,7 @@ class CharObject(Object):
 
         return self.withOffset(1)
 
-    @method("Char")
+    @method("Char", _pure=True)
     def previous(self):
         """
         The preceding code point.
@@ -153,7 +153,7 @@ class CharObject(Object):
 
         return self.withOffset(-1)
 
-    @method("Int", "Char")
+    @method("Int", "Char", _pure=True)
     def op__cmp(self, other):
         """
         General comparison of characters.
@@ -161,7 +161,7 @@ class CharObject(Object):
 
         return cmp(self._c, other)
 
-    @method("Str")
+    @method("Str", _pure=True)
     def quote(self):
         """
         A string quoting this object.
@@ -171,7 +171,7 @@ class CharObject(Object):
 
         return quoteChar(self._c)
 
-    @method("Char", "Int")
+    @method("Char", "Int", _pure=True)
     def subtract(self, other):
         """
         Subtract from this object's code point, producing another character.
@@ -233,7 +233,7 @@ class DoubleObject(Object):
     def optInterface(self):
         return getGlobalValue(u"Double")
 
-    @method("Any", "Any")
+    @method("Any", "Any", _pure=True)
     def op__cmp(self, other):
         # Doubles can be compared.
         other = promoteToDouble(other)
@@ -244,122 +244,122 @@ class DoubleObject(Object):
 
     # Doubles are related to zero.
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def aboveZero(self):
         return self._d > 0.0
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def atLeastZero(self):
         return self._d >= 0.0
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def atMostZero(self):
         return self._d <= 0.0
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def belowZero(self):
         return self._d < 0.0
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def isZero(self):
         return self._d == 0.0
 
-    @method("Double")
+    @method("Double", _pure=True)
     def abs(self):
         return abs(self._d)
 
-    @method("Int")
+    @method("Int", _pure=True)
     def floor(self):
         return int(self._d)
 
-    @method("Double")
+    @method("Double", _pure=True)
     def negate(self):
         return -self._d
 
-    @method("Double")
+    @method("Double", _pure=True)
     def sqrt(self):
         return math.sqrt(self._d)
 
-    @method("Double", "Double")
+    @method("Double", "Double", _pure=True)
     def approxDivide(self, divisor):
         return self._d / divisor
 
-    @method("Double", "Int", _verb="approxDivide")
+    @method("Double", "Int", _verb="approxDivide", _pure=True)
     def approxDivideInt(self, divisor):
         return self._d / divisor
 
-    @method("Int", "Double")
+    @method("Int", "Double", _pure=True)
     def floorDivide(self, divisor):
         return int(math.floor(self._d / divisor))
 
-    @method("Int", "Int", _verb="floorDivide")
+    @method("Int", "Int", _verb="floorDivide", _pure=True)
     def floorDivideInt(self, divisor):
         return int(math.floor(self._d / divisor))
 
-    @method("Double", "Double")
+    @method("Double", "Double", _pure=True)
     def pow(self, exponent):
         return math.pow(self._d, exponent)
 
-    @method("Double", "Int", _verb="pow")
+    @method("Double", "Int", _verb="pow", _pure=True)
     def powInt(self, exponent):
         return math.pow(self._d, exponent)
 
     # Logarithms.
 
-    @method("Double")
+    @method("Double", _pure=True)
     def log(self):
         return math.log(self._d)
 
-    @method("Double", "Double", _verb="log")
+    @method("Double", "Double", _verb="log", _pure=True)
     def logBase(self, base):
         return math.log(self._d) / math.log(base)
 
-    @method("Double", "Int", _verb="log")
+    @method("Double", "Int", _verb="log", _pure=True)
     def logBaseInt(self, base):
         return math.log(self._d) / math.log(base)
 
     # Trigonometry.
 
-    @method("Double")
+    @method("Double", _pure=True)
     def sin(self):
         return math.sin(self._d)
 
-    @method("Double")
+    @method("Double", _pure=True)
     def cos(self):
         return math.cos(self._d)
 
-    @method("Double")
+    @method("Double", _pure=True)
     def tan(self):
         return math.tan(self._d)
 
-    @method("Bytes")
+    @method("Bytes", _pure=True)
     def toBytes(self):
         # float_pack() takes a double and gives us the packed integer; we need
         # to reinterpret it as packed ASCII and repack into bytes.
         x = float_pack(self._d, 8)
         return "".join([chr(x >> ((7 - i) * 8) & 0xff) for i in range(8)])
 
-    @method("Double", "Double")
+    @method("Double", "Double", _pure=True)
     def add(self, other):
         return self._d + other
 
-    @method("Double", "Int", _verb="add")
+    @method("Double", "Int", _verb="add", _pure=True)
     def addInt(self, other):
         return self._d + other
 
-    @method("Double", "Double")
+    @method("Double", "Double", _pure=True)
     def multiply(self, other):
         return self._d * other
 
-    @method("Double", "Int", _verb="multiply")
+    @method("Double", "Int", _verb="multiply", _pure=True)
     def multiplyInt(self, other):
         return self._d * other
 
-    @method("Double", "Double")
+    @method("Double", "Double", _pure=True)
     def subtract(self, other):
         return self._d - other
 
-    @method("Double", "Int", _verb="subtract")
+    @method("Double", "Int", _verb="subtract", _pure=True)
     def subtractInt(self, other):
         return self._d - other
 
@@ -425,22 +425,22 @@ class IntObject(Object):
     def optInterface(self):
         return getGlobalValue(u"Int")
 
-    @method("Int")
+    @method("Int", _pure=True)
     def abs(self):
         return abs(self._i)
 
-    @method("Double")
+    @method("Double", _pure=True)
     def asDouble(self):
         return float(self._i)
 
-    @method("Any", "Double", _verb="op__cmp")
+    @method("Any", "Double", _verb="op__cmp", _pure=True)
     def op__cmpDouble(self, other):
         if math.isnan(other):
             # Whoa there! Gotta watch out for those pesky NaNs.
             return NaN
         return polyCmp(self._i, other)
 
-    @method("Int", "BigInt", _verb="op__cmp")
+    @method("Int", "BigInt", _verb="op__cmp", _pure=True)
     def op__cmpBigInt(self, other):
         # This has to be switched around.
         if other.int_lt(self._i):
@@ -451,56 +451,56 @@ class IntObject(Object):
             # Using a property of integers here.
             return 0
 
-    @method("Int", "Int")
+    @method("Int", "Int", _pure=True)
     def op__cmp(self, other):
         return cmp(self._i, other)
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def aboveZero(self):
         return self._i > 0
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def atLeastZero(self):
         return self._i >= 0
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def atMostZero(self):
         return self._i <= 0
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def belowZero(self):
         return self._i < 0
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def isZero(self):
         return self._i == 0
 
-    @method("Double", "Double", _verb="add")
+    @method("Double", "Double", _verb="add", _pure=True)
     def addDouble(self, other):
         return self._i + other
 
-    @method("BigInt", "BigInt", _verb="add")
+    @method("BigInt", "BigInt", _verb="add", _pure=True)
     def addBigInt(self, other):
         # Addition commutes.
         return other.int_add(self._i)
 
-    @method("Any", "Int")
+    @method("Any", "Int", _pure=True)
     def add(self, other):
         try:
             return IntObject(ovfcheck(self._i + other))
         except OverflowError:
             return BigInt(rbigint.fromint(self._i).int_add(other))
 
-    @method("BigInt", "BigInt", _verb="and")
+    @method("BigInt", "BigInt", _verb="and", _pure=True)
     def andBigInt(self, other):
         # AND commutes.
         return other.int_and_(self._i)
 
-    @method("Int", "Int", _verb="and")
+    @method("Int", "Int", _verb="and", _pure=True)
     def _and(self, other):
         return self._i & other
 
-    @method("Any", "Any")
+    @method("Any", "Any", _pure=True)
     def approxDivide(self, other):
         """
         Promote this object to `Double` and perform division with a given
@@ -514,30 +514,30 @@ class IntObject(Object):
             # We tried to divide by zero.
             return NaN
 
-    @method("Int")
+    @method("Int", _pure=True)
     def complement(self):
         return ~self._i
 
-    @method("BigInt", "BigInt", _verb="floorDivide")
+    @method("BigInt", "BigInt", _verb="floorDivide", _pure=True)
     def floorDivideBigInt(self, divisor):
         return rbigint.fromint(self._i).floordiv(divisor)
 
-    @method("Int", "Int")
+    @method("Int", "Int", _pure=True)
     def floorDivide(self, divisor):
         try:
             return self._i // divisor
         except ZeroDivisionError:
             raise userError(u"floorDivide/1: Integer division by zero")
 
-    @method("Int", "Int")
+    @method("Int", "Int", _pure=True)
     def max(self, other):
         return max(self._i, other)
 
-    @method("Int", "Int")
+    @method("Int", "Int", _pure=True)
     def min(self, other):
         return min(self._i, other)
 
-    @method("Any", "Int", "Int")
+    @method("Any", "Int", "Int", _pure=True)
     def modPow(self, exponent, modulus):
         try:
             return self.intModPow(exponent, modulus)
@@ -545,14 +545,14 @@ class IntObject(Object):
             return BigInt(rbigint.fromint(self._i).pow(rbigint.fromint(exponent),
                                                        rbigint.fromint(modulus)))
 
-    @method("Int", "Int")
+    @method("Int", "Int", _pure=True)
     def mod(self, modulus):
         try:
             return self._i % modulus
         except ZeroDivisionError:
             raise userError(u"mod/1: Integer division by zero")
 
-    @method("List", "Int")
+    @method("List", "Int", _pure=True)
     def divMod(self, modulus):
         """
         Compute the pair `[quotient, remainder]` such that `modulus *
@@ -567,51 +567,51 @@ class IntObject(Object):
         except ZeroDivisionError:
             raise userError(u"divMod/1: Integer division by zero")
 
-    @method("Double", "Double", _verb="multiply")
+    @method("Double", "Double", _verb="multiply", _pure=True)
     def multiplyDouble(self, other):
         return self._i * other
 
-    @method("BigInt", "BigInt", _verb="multiply")
+    @method("BigInt", "BigInt", _verb="multiply", _pure=True)
     def multiplyBigInt(self, other):
         # Multiplication commutes.
         return other.int_mul(self._i)
 
-    @method("Any", "Int")
+    @method("Any", "Int", _pure=True)
     def multiply(self, other):
         try:
             return IntObject(ovfcheck(self._i * other))
         except OverflowError:
             return BigInt(rbigint.fromint(self._i).int_mul(other))
 
-    @method("Int")
+    @method("Int", _pure=True)
     def negate(self):
         return -self._i
 
-    @method("Int")
+    @method("Int", _pure=True)
     def next(self):
         return self._i + 1
 
-    @method("BigInt", "BigInt", _verb="or")
+    @method("BigInt", "BigInt", _verb="or", _pure=True)
     def orBigInt(self, other):
         # OR commutes.
         return other.int_or_(self._i)
 
-    @method("Int", "Int", _verb="or")
+    @method("Int", "Int", _verb="or", _pure=True)
     def _or(self, other):
         return self._i | other
 
-    @method("Any", "Int")
+    @method("Any", "Int", _pure=True)
     def pow(self, exponent):
         try:
             return self.intPow(exponent)
         except OverflowError:
             return BigInt(rbigint.fromint(self._i).pow(rbigint.fromint(exponent)))
 
-    @method("Int")
+    @method("Int", _pure=True)
     def previous(self):
         return self._i - 1
 
-    @method("Any", "Int")
+    @method("Any", "Int", _pure=True)
     def shiftLeft(self, other):
         try:
             if other >= LONG_BIT:
@@ -622,7 +622,7 @@ class IntObject(Object):
         except OverflowError:
             return BigInt(rbigint.fromint(self._i).lshift(other))
 
-    @method("Int", "Int")
+    @method("Int", "Int", _pure=True)
     def shiftRight(self, other):
         if other >= LONG_BIT:
             # This'll underflow, returning who-knows-what when translated.
@@ -632,35 +632,35 @@ class IntObject(Object):
             return 0
         return self._i >> other
 
-    @method("Double", "Double", _verb="subtract")
+    @method("Double", "Double", _verb="subtract", _pure=True)
     def subtractDouble(self, other):
         return self._i - other
 
-    @method("BigInt", "BigInt", _verb="subtract")
+    @method("BigInt", "BigInt", _verb="subtract", _pure=True)
     def subtractBigInt(self, other):
         # Subtraction doesn't commute, so we have to work a little harder.
         return rbigint.fromint(self._i).sub(other)
 
-    @method("Any", "Int")
+    @method("Any", "Int", _pure=True)
     def subtract(self, other):
         try:
             return IntObject(ovfcheck(self._i - other))
         except OverflowError:
             return BigInt(rbigint.fromint(self._i).int_sub(other))
 
-    @method("BigInt", "BigInt", _verb="xor")
+    @method("BigInt", "BigInt", _verb="xor", _pure=True)
     def xorBigInt(self, other):
         # XOR commutes.
         return other.int_xor(self._i)
 
-    @method("Int", "Int")
+    @method("Int", "Int", _pure=True)
     def xor(self, other):
         return self._i ^ other
 
     def getInt(self):
         return self._i
 
-    @method("Int")
+    @method("Int", _pure=True)
     @elidable
     def bitLength(self):
         i = self._i
@@ -753,92 +753,92 @@ class BigInt(Object):
         return (rgc.get_rpy_memory_usage(self) +
                 rgc.get_rpy_memory_usage(self.bi))
 
-    @method("Double")
+    @method("Double", _pure=True)
     def asDouble(self):
         return self.bi.tofloat()
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def aboveZero(self):
         return self.bi.int_gt(0)
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def atLeastZero(self):
         return self.bi.int_ge(0)
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def atMostZero(self):
         return self.bi.int_le(0)
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def belowZero(self):
         return self.bi.int_lt(0)
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def isZero(self):
         return self.bi.int_eq(0)
 
-    @method("BigInt")
+    @method("BigInt", _pure=True)
     def abs(self):
         return self.bi.abs()
 
-    @method("Double", "Double", _verb="add")
+    @method("Double", "Double", _verb="add", _pure=True)
     def addDouble(self, other):
         return self.bi.tofloat() + other
 
-    @method("BigInt", "BigInt")
+    @method("BigInt", "BigInt", _pure=True)
     def add(self, other):
         return self.bi.add(other)
 
-    @method("BigInt", "Int", _verb="add")
+    @method("BigInt", "Int", _verb="add", _pure=True)
     def addInt(self, other):
         return self.bi.int_add(other)
 
-    @method("BigInt", "BigInt", _verb="and")
+    @method("BigInt", "BigInt", _verb="and", _pure=True)
     def _and(self, other):
         return self.bi.and_(other)
 
-    @method("BigInt", "Int", _verb="and")
+    @method("BigInt", "Int", _verb="and", _pure=True)
     def _andInt(self, other):
         return self.bi.int_and_(other)
 
-    @method("Double", "Double", _verb="approxDivide")
+    @method("Double", "Double", _verb="approxDivide", _pure=True)
     def approxDivideDouble(self, other):
         return self.bi.tofloat() / other
 
-    @method("Any", "BigInt")
+    @method("Any", "BigInt", _pure=True)
     def approxDivide(self, other):
         try:
             return DoubleObject(self.bi.truediv(other))
         except ZeroDivisionError:
             return NaN
 
-    @method("Any", "Int", _verb="approxDivide")
+    @method("Any", "Int", _verb="approxDivide", _pure=True)
     def approxDivideInt(self, other):
         try:
             return DoubleObject(self.bi.truediv(rbigint.fromint(other)))
         except ZeroDivisionError:
             return NaN
 
-    @method("BigInt", "Double", _verb="floorDivide")
+    @method("BigInt", "Double", _verb="floorDivide", _pure=True)
     def floorDivideDouble(self, other):
         # Of the two ways to lose precision, we had to choose one. ~ C.
         return rbigint.fromfloat(self.bi.tofloat() / other)
 
-    @method("BigInt", "BigInt")
+    @method("BigInt", "BigInt", _pure=True)
     def floorDivide(self, other):
         try:
             return self.bi.floordiv(other)
         except ZeroDivisionError:
             raise userError(u"floorDivide/1: Integer division by zero")
 
-    @method("BigInt", "Int", _verb="floorDivide")
+    @method("BigInt", "Int", _verb="floorDivide", _pure=True)
     def floorDivideInt(self, other):
         try:
             return self.bi.floordiv(rbigint.fromint(other))
         except ZeroDivisionError:
             raise userError(u"floorDivide/1: Integer division by zero")
 
-    @method("Int")
+    @method("Int", _pure=True)
     def bitLength(self):
         """
         The number of bits required to store this object's value.
@@ -846,23 +846,23 @@ class BigInt(Object):
 
         return self.bi.bit_length()
 
-    @method("BigInt")
+    @method("BigInt", _pure=True)
     def complement(self):
         return self.bi.invert()
 
-    @method("BigInt", "BigInt")
+    @method("BigInt", "BigInt", _pure=True)
     def max(self, other):
         return self.bi if self.bi.gt(other) else other
 
-    @method("BigInt", "Int", _verb="max")
+    @method("BigInt", "Int", _verb="max", _pure=True)
     def maxInt(self, other):
         return self.bi if self.bi.int_gt(other) else rbigint.fromint(other)
 
-    @method("BigInt", "BigInt")
+    @method("BigInt", "BigInt", _pure=True)
     def min(self, other):
         return self.bi if self.bi.lt(other) else other
 
-    @method("BigInt", "Int", _verb="min")
+    @method("BigInt", "Int", _verb="min", _pure=True)
     def minInt(self, other):
         return self.bi if self.bi.int_lt(other) else rbigint.fromint(other)
 
@@ -870,27 +870,27 @@ class BigInt(Object):
     # be coerced into an int, then it is too big for the machine that we're
     # currently running on. ~ C.
 
-    @method("BigInt", "Int", "BigInt")
+    @method("BigInt", "Int", "BigInt", _pure=True)
     def modPow(self, exponent, modulus):
         return self.bi.pow(rbigint.fromint(exponent), modulus)
 
-    @method("BigInt", "Int", "Int", _verb="modPow")
+    @method("BigInt", "Int", "Int", _verb="modPow", _pure=True)
     def modPowInt(self, exponent, modulus):
         return self.bi.pow(rbigint.fromint(exponent),
                 rbigint.fromint(modulus))
 
-    @method("BigInt", "Int")
+    @method("BigInt", "Int", _pure=True)
     def pow(self, exponent):
         return self.bi.pow(rbigint.fromint(exponent))
 
-    @method("BigInt", "BigInt")
+    @method("BigInt", "BigInt", _pure=True)
     def mod(self, modulus):
         try:
             return self.bi.mod(modulus)
         except ZeroDivisionError:
             raise userError(u"mod/1: Integer division by zero")
 
-    @method("BigInt", "Int", _verb="mod")
+    @method("BigInt", "Int", _verb="mod", _pure=True)
     def modInt(self, modulus):
         try:
             return self.bi.int_mod(modulus)
@@ -904,75 +904,75 @@ class BigInt(Object):
         except ZeroDivisionError:
             raise userError(u"divMod/1: Integer division by zero")
 
-    @method("List", "BigInt")
+    @method("List", "BigInt", _pure=True)
     def divMod(self, modulus):
         return self._divMod(modulus)
 
-    @method("List", "Int", _verb="divMod")
+    @method("List", "Int", _verb="divMod", _pure=True)
     def divModInt(self, modulus):
         return self._divMod(rbigint.fromint(modulus))
 
-    @method("Double", "Double", _verb="multiply")
+    @method("Double", "Double", _verb="multiply", _pure=True)
     def multiplyDouble(self, other):
         return self.bi.tofloat() * other
 
-    @method("BigInt", "BigInt")
+    @method("BigInt", "BigInt", _pure=True)
     def multiply(self, other):
         return self.bi.mul(other)
 
-    @method("BigInt", "Int", _verb="multiply")
+    @method("BigInt", "Int", _verb="multiply", _pure=True)
     def multiplyInt(self, other):
         return self.bi.int_mul(other)
 
-    @method("BigInt")
+    @method("BigInt", _pure=True)
     def negate(self):
         return self.bi.neg()
 
-    @method("BigInt")
+    @method("BigInt", _pure=True)
     def next(self):
         return self.bi.int_add(1)
 
-    @method("BigInt", "BigInt", _verb="or")
+    @method("BigInt", "BigInt", _verb="or", _pure=True)
     def _or(self, other):
         return self.bi.or_(other)
 
-    @method("BigInt", "Int", _verb="or")
+    @method("BigInt", "Int", _verb="or", _pure=True)
     def orInt(self, other):
         return self.bi.int_or_(other)
 
-    @method("BigInt")
+    @method("BigInt", _pure=True)
     def previous(self):
         return self.bi.int_sub(1)
 
-    @method("BigInt", "Int")
+    @method("BigInt", "Int", _pure=True)
     def shiftLeft(self, other):
         return self.bi.lshift(other)
 
-    @method("BigInt", "Int")
+    @method("BigInt", "Int", _pure=True)
     def shiftRight(self, other):
         return self.bi.rshift(other)
 
-    @method("Double", "Double", _verb="subtract")
+    @method("Double", "Double", _verb="subtract", _pure=True)
     def subtractDouble(self, other):
         return self.bi.tofloat() - other
 
-    @method("BigInt", "BigInt")
+    @method("BigInt", "BigInt", _pure=True)
     def subtract(self, other):
         return self.bi.sub(other)
 
-    @method("BigInt", "Int", _verb="subtract")
+    @method("BigInt", "Int", _verb="subtract", _pure=True)
     def subtractInt(self, other):
         return self.bi.int_sub(other)
 
-    @method("BigInt", "BigInt")
+    @method("BigInt", "BigInt", _pure=True)
     def xor(self, other):
         return self.bi.xor(other)
 
-    @method("BigInt", "Int", _verb="xor")
+    @method("BigInt", "Int", _verb="xor", _pure=True)
     def xorInt(self, other):
         return self.bi.int_xor(other)
 
-    @method("Int", "BigInt")
+    @method("Int", "BigInt", _pure=True)
     def op__cmp(self, other):
         if self.bi.lt(other):
             return -1
@@ -982,7 +982,7 @@ class BigInt(Object):
             # Using a property of integers here.
             return 0
 
-    @method("Int", "Int", _verb="op__cmp")
+    @method("Int", "Int", _verb="op__cmp", _pure=True)
     def op__cmpInt(self, other):
         if self.bi.int_lt(other):
             return -1
@@ -1222,7 +1222,7 @@ class StrObject(Object):
     def optInterface(self):
         return getGlobalValue(u"Str")
 
-    @method("Str", "Any")
+    @method("Str", "Any", _pure=True)
     def add(self, other):
         if isinstance(other, StrObject):
             return self._s + other._s
@@ -1230,7 +1230,7 @@ class StrObject(Object):
             return self._s + unicode(other._c)
         raise WrongType(u"Not a string or char!")
 
-    @method("Bool", "Any")
+    @method("Bool", "Any", _pure=True)
     def contains(self, needle):
         if isinstance(needle, CharObject):
             return needle._c in self._s
@@ -1238,71 +1238,71 @@ class StrObject(Object):
             return needle._s in self._s
         raise WrongType(u"Not a string or char!")
 
-    @method("Bool", "Str")
+    @method("Bool", "Str", _pure=True)
     def startsWith(self, s):
         "Whether this string has `s` as a prefix."
         return self._s.startswith(s)
 
-    @method("Bool", "Str")
+    @method("Bool", "Str", _pure=True)
     def endsWith(self, s):
         return self._s.endswith(s)
 
-    @method("Char", "Int")
+    @method("Char", "Int", _pure=True)
     def get(self, index):
         if not 0 <= index < len(self._s):
             raise userError(u"string.get/1: Index out of bounds: %d" % index)
         return self._s[index]
 
-    @method("Void")
+    @method("Void", _pure=True)
     def getSpan(self):
         pass
 
-    @method("Int", "Str")
+    @method("Int", "Str", _pure=True)
     def indexOf(self, needle):
         return self._s.find(needle)
 
-    @method("Int", "Str", "Int", _verb="indexOf")
+    @method("Int", "Str", "Int", _verb="indexOf", _pure=True)
     def _indexOf(self, needle, offset):
         if offset < 0:
             raise userError(u"indexOf/2: Negative offset %d not supported"
                             % offset)
         return self._s.find(needle, offset)
 
-    @method("Int", "Str")
+    @method("Int", "Str", _pure=True)
     def lastIndexOf(self, needle):
         return self._s.rfind(needle)
 
-    @method("Str", "Int")
+    @method("Str", "Int", _pure=True)
     def multiply(self, amount):
         return self._s * amount
 
-    @method("Int", "Str")
+    @method("Int", "Str", _pure=True)
     def op__cmp(self, other):
         return cmp(self._s, other)
 
-    @method("Str", "Str", "Str")
+    @method("Str", "Str", "Str", _pure=True)
     def replace(self, src, dest):
         return replace(self._s, src, dest)
 
-    @method("Str")
+    @method("Str", _pure=True)
     def quote(self):
         return quoteStr(self._s)
 
-    @method("Int")
+    @method("Int", _pure=True)
     def size(self):
         return len(self._s)
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def isEmpty(self):
         return not self._s
 
-    @method("Str", "Int")
+    @method("Str", "Int", _pure=True)
     def slice(self, start):
         if start < 0:
             raise userError(u"Slice start cannot be negative")
         return self._s[start:]
 
-    @method("Str", "Int", "Int", _verb="slice")
+    @method("Str", "Int", "Int", _verb="slice", _pure=True)
     def _slice(self, start, stop):
         if start < 0:
             raise userError(u"Slice start cannot be negative")
@@ -1310,7 +1310,7 @@ class StrObject(Object):
             raise userError(u"Slice stop cannot be negative")
         return self._s[start:stop]
 
-    @method("Str", "Char", _verb="with")
+    @method("Str", "Char", _verb="with", _pure=True)
     def _with(self, c):
         return self._s + c
 
@@ -1321,11 +1321,11 @@ class StrObject(Object):
     def getString(self):
         return self._s
 
-    @method("List")
+    @method("List", _pure=True)
     def asList(self):
         return [CharObject(c) for c in self._s]
 
-    @method("Set")
+    @method("Set", _pure=True)
     def asSet(self):
         from typhon.objects.collections.sets import monteSet
         d = monteSet()
@@ -1333,7 +1333,7 @@ class StrObject(Object):
             d[CharObject(c)] = None
         return d
 
-    @method("Str", "List")
+    @method("Str", "List", _pure=True)
     def join(self, pieces):
         ub = UnicodeBuilder()
         first = True
@@ -1350,15 +1350,15 @@ class StrObject(Object):
             ub.append(string)
         return ub.build()
 
-    @method("List", "Str")
+    @method("List", "Str", _pure=True)
     def split(self, splitter):
         return [StrObject(s) for s in split(self._s, splitter)]
 
-    @method("List", "Str", "Int", _verb="split")
+    @method("List", "Str", "Int", _verb="split", _pure=True)
     def _split(self, splitter, splits=-1):
         return [StrObject(s) for s in split(self._s, splitter, splits)]
 
-    @method("Str")
+    @method("Str", _pure=True)
     def toLowerCase(self):
         # Use current size as a size hint. In the best case, characters
         # are one-to-one; in the next-best case, we overestimate and end
@@ -1368,7 +1368,7 @@ class StrObject(Object):
             ub.append(unichr(unicodedb.tolower(ord(char))))
         return ub.build()
 
-    @method("Str")
+    @method("Str", _pure=True)
     def toUpperCase(self):
         # Same as toLowerCase().
         ub = UnicodeBuilder(len(self._s))
@@ -1376,7 +1376,7 @@ class StrObject(Object):
             ub.append(unichr(unicodedb.toupper(ord(char))))
         return ub.build()
 
-    @method("Str")
+    @method("Str", _pure=True)
     def trim(self):
         if len(self._s) == 0:
             return u""
@@ -1486,7 +1486,7 @@ class BytesObject(Object):
     def optInterface(self):
         return getGlobalValue(u"Bytes")
 
-    @method("List")
+    @method("List", _pure=True)
     def _uncall(self):
         from typhon.objects.makers import theMakeBytes
         from typhon.objects.collections.lists import wrapList
@@ -1495,7 +1495,7 @@ class BytesObject(Object):
         return [theMakeBytes, StrObject(u"fromInts"),
                 wrapList([wrapList(ints)]), EMPTY_MAP]
 
-    @method("Bytes", "Any")
+    @method("Bytes", "Any", _pure=True)
     def add(self, other):
         if isinstance(other, BytesObject):
             return self._bs + other._bs
@@ -1503,7 +1503,7 @@ class BytesObject(Object):
             return self._bs + str(chr(other._i))
         raise WrongType(u"Not an int or bytestring!")
 
-    @method("Bool", "Any")
+    @method("Bool", "Any", _pure=True)
     def contains(self, needle):
         if isinstance(needle, IntObject):
             return chr(needle._i) in self._bs
@@ -1511,55 +1511,55 @@ class BytesObject(Object):
             return needle._bs in self._bs
         raise WrongType(u"Not an int or bytestring!")
 
-    @method("Int", "Int")
+    @method("Int", "Int", _pure=True)
     def get(self, index):
         if not 0 <= index < len(self._bs):
             raise userError(u"string.get/1: Index out of bounds: %d" %
                             index)
         return ord(self._bs[index])
 
-    @method("Int", "Bytes")
+    @method("Int", "Bytes", _pure=True)
     def indexOf(self, needle):
         return self._bs.find(needle)
 
-    @method("Int", "Bytes", "Int", _verb="indexOf")
+    @method("Int", "Bytes", "Int", _verb="indexOf", _pure=True)
     def _indexOf(self, needle, offset):
         if offset < 0:
             raise userError(u"indexOf/2: Negative offset %d not supported"
                             % offset)
         return self._bs.find(needle, offset)
 
-    @method("Int", "Bytes")
+    @method("Int", "Bytes", _pure=True)
     def lastIndexOf(self, needle):
         return self._bs.rfind(needle)
 
-    @method("Bytes", "Int")
+    @method("Bytes", "Int", _pure=True)
     def multiply(self, amount):
         return self._bs * amount
 
-    @method("Int", "Bytes")
+    @method("Int", "Bytes", _pure=True)
     def op__cmp(self, other):
         return cmp(self._bs, other)
 
-    @method("Bytes", "Bytes", "Bytes")
+    @method("Bytes", "Bytes", "Bytes", _pure=True)
     def replace(self, src, dest):
         return replace(self._bs, src, dest)
 
-    @method("Int")
+    @method("Int", _pure=True)
     def size(self):
         return len(self._bs)
 
-    @method("Bool")
+    @method("Bool", _pure=True)
     def isEmpty(self):
         return not self._bs
 
-    @method("Bytes", "Int")
+    @method("Bytes", "Int", _pure=True)
     def slice(self, start):
         if start < 0:
             raise userError(u"Slice start cannot be negative")
         return self._bs[start:]
 
-    @method("Bytes", "Int", "Int", _verb="slice")
+    @method("Bytes", "Int", "Int", _verb="slice", _pure=True)
     def _slice(self, start, stop):
         if start < 0:
             raise userError(u"Slice start cannot be negative")
@@ -1567,7 +1567,7 @@ class BytesObject(Object):
             raise userError(u"Slice stop cannot be negative")
         return self._bs[start:stop]
 
-    @method("Bytes", "Int", _verb="with")
+    @method("Bytes", "Int", _verb="with", _pure=True)
     def _with(self, i):
         return self._bs + chr(i)
 
@@ -1578,11 +1578,11 @@ class BytesObject(Object):
     def getBytes(self):
         return self._bs
 
-    @method("List")
+    @method("List", _pure=True)
     def asList(self):
         return [IntObject(ord(c)) for c in self._bs]
 
-    @method("Set")
+    @method("Set", _pure=True)
     def asSet(self):
         from typhon.objects.collections.sets import monteSet
         d = monteSet()
@@ -1590,7 +1590,7 @@ class BytesObject(Object):
             d[IntObject(ord(c))] = None
         return d
 
-    @method("Bytes", "List")
+    @method("Bytes", "List", _pure=True)
     def join(self, pieces):
         sb = StringBuilder()
         first = True
@@ -1607,23 +1607,23 @@ class BytesObject(Object):
             sb.append(string)
         return sb.build()
 
-    @method("List", "Bytes")
+    @method("List", "Bytes", _pure=True)
     def split(self, splitter):
         return [BytesObject(s) for s in split(self._bs, splitter)]
 
-    @method("List", "Bytes", "Int", _verb="split")
+    @method("List", "Bytes", "Int", _verb="split", _pure=True)
     def _split(self, splitter, splits):
         return [BytesObject(s) for s in split(self._bs, splitter, splits)]
 
-    @method("Bytes")
+    @method("Bytes", _pure=True)
     def toLowerCase(self):
         return self._bs.lower()
 
-    @method("Bytes")
+    @method("Bytes", _pure=True)
     def toUpperCase(self):
         return self._bs.upper()
 
-    @method("Bytes")
+    @method("Bytes", _pure=True)
     def trim(self):
         if len(self._bs) == 0:
             return ""
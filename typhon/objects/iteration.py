@@ -18,9 +18,11 @@ from typhon.atoms import getAtom
 from typhon.errors import Ejecting
 from typhon.nano.interp import InterpObject
 from typhon.objects.auditors import deepFrozenStamp
-from typhon.objects.collections.lists import unwrapList
-from typhon.objects.collections.maps import EMPTY_MAP
+from typhon.objects.collections.lists import ConstList, FlexList, unwrapList
+from typhon.objects.collections.maps import ConstMap, EMPTY_MAP
+from typhon.objects.collections.sets import ConstSet
 from typhon.objects.constants import NullObject
+from typhon.objects.data import BytesObject, CharObject, IntObject, StrObject
 from typhon.objects.ejectors import Ejector
 from typhon.objects.root import runnable
 
@@ -36,6 +38,22 @@ loopDriver = JitDriver(greens=["method", "displayName"],
                        reds=["consumer", "ejector", "iterator"],
                        get_printable_location=getLocation)
 
+objectsDriver = JitDriver(greens=["method", "displayName"],
+                          reds=["index", "consumer", "objects"],
+                          get_printable_location=getLocation)
+
+pairsDriver = JitDriver(greens=["method", "displayName"],
+                        reds=["index", "consumer", "pairs"],
+                        get_printable_location=getLocation)
+
+strDriver = JitDriver(greens=["method", "displayName"],
+                      reds=["index", "consumer", "s"],
+                      get_printable_location=getLocation)
+
+bytesDriver = JitDriver(greens=["method", "displayName"],
+                        reds=["index", "consumer", "bs"],
+                        get_printable_location=getLocation)
+
 
 def slowLoop(iterable, consumer):
     iterator = iterable.call(u"_makeIterator", [])
@@ -54,6 +72,79 @@ def slowLoop(iterable, consumer):
     return NullObject
 
 
+def loopObjects(method, displayName, consumer, objects):
+    index = 0
+    while index < len(objects):
+        objectsDriver.jit_merge_point(method=method, displayName=displayName,
+                consumer=consumer, objects=objects, index=index)
+        consumer.runMethod(method, [IntObject(index), objects[index]],
+                           EMPTY_MAP)
+        index += 1
+
+
+def loopPairs(method, displayName, consumer, pairs):
+    index = 0
+    while index < len(pairs):
+        pairsDriver.jit_merge_point(method=method, displayName=displayName,
+                consumer=consumer, pairs=pairs, index=index)
+        k, v = pairs[index]
+        consumer.runMethod(method, [k, v], EMPTY_MAP)
+        index += 1
+
+
+def loopStr(method, displayName, consumer, s):
+    index = 0
+    while index < len(s):
+        strDriver.jit_merge_point(method=method, displayName=displayName,
+                consumer=consumer, s=s, index=index)
+        consumer.runMethod(method, [IntObject(index), CharObject(s[index])],
+                           EMPTY_MAP)
+        index += 1
+
+
+def loopBytes(method, displayName, consumer, bs):
+    index = 0
+    while index < len(bs):
+        bytesDriver.jit_merge_point(method=method, displayName=displayName,
+                consumer=consumer, bs=bs, index=index)
+        consumer.runMethod(method,
+                           [IntObject(index), IntObject(ord(bs[index]))],
+                           EMPTY_MAP)
+        index += 1
+
+
+def fastLoop(iterable, consumer, method, displayName):
+    """
+    Iterate directly over the storage of a builtin collection, without
+    building an iterator or any pairs of keys and values.
+
+    The consumer sees the same keys and values, in the same order, as it
+    would from the collection's _makeIterator().
+
+    Returns whether the iterable was a collection which could be iterated.
+    """
+
+    if isinstance(iterable, ConstList):
+        loopObjects(method, displayName, consumer, iterable.objs)
+    elif isinstance(iterable, FlexList):
+        # Iterate over a snapshot, just like FlexList._makeIterator().
+        loopObjects(method, displayName, consumer,
+                    iterable.strategy.fetch_all(iterable))
+    elif isinstance(iterable, ConstSet):
+        loopObjects(method, displayName, consumer,
+                    iterable.objectSet.keys())
+    elif isinstance(iterable, ConstMap):
+        loopPairs(method, displayName, consumer,
+                  iterable.objectMap.items())
+    elif isinstance(iterable, StrObject):
+        loopStr(method, displayName, consumer, iterable._s)
+    elif isinstance(iterable, BytesObject):
+        loopBytes(method, displayName, consumer, iterable._bs)
+    else:
+        return False
+    return True
+
+
 @runnable(RUN_2, [deepFrozenStamp])
 def loop(iterable, consumer):
     """
@@ -76,6 +167,11 @@ def loop(iterable, consumer):
     if method is None:
         return slowLoop(iterable, consumer)
 
+    # Common path: Builtin collections can be walked without the iterator
+    # protocol.
+    if fastLoop(iterable, consumer, method, displayName):
+        return NullObject
+
     iterator = iterable.call(u"_makeIterator", [])
 
     # XXX We want to use a with-statement here, but we cannot because of
@@ -692,8 +692,44 @@ def packLocalRef(obj, objVat, originVat):
         log(["ref"], u"Short-circuiting round-trip ref for vat %s" %
             objVat.name)
         return obj.target
+    elif isShareable(obj, 0):
+        # Deeply immutable; the other vat can't tell a copy from the original,
+        # so don't bother making either.
+        return obj
     return LocalVatRef(obj, objVat, originVat)
 
+# How deeply to look into nested lists and maps before giving up and
+# wrapping them instead.
+SHAREABLE_DEPTH = 8
+
+def isShareable(obj, depth):
+    """
+    Whether `obj` can be handed directly to another vat in this runtime.
+
+    DeepFrozen objects are shareable. So are lists and maps which are made
+    only of shareable objects.
+    """
+
+    from typhon.objects.collections.lists import ConstList
+    from typhon.objects.collections.maps import ConstMap
+    if isinstance(obj, Promise):
+        return False
+    if obj.auditedBy(deepFrozenStamp):
+        return True
+    if depth >= SHAREABLE_DEPTH:
+        return False
+    if isinstance(obj, ConstList):
+        for o in obj.objs:
+            if not isShareable(o, depth + 1):
+                return False
+        return True
+    if isinstance(obj, ConstMap):
+        for k, v in obj.objectMap.iteritems():
+            if not (isShareable(k, depth + 1) and isShareable(v, depth + 1)):
+                return False
+        return True
+    return False
+
 def packLocalRefs(args, targetVat, originVat):
     # XXX Upgrade this to honor the real serialization protocol.
     return [packLocalRef(arg, targetVat, originVat) for arg in args]
@@ -47,7 +47,7 @@ def makeMirandaArgs():
     mirandaArgs[StrObject(u"FAIL")] = theThrower
     return mirandaArgs
 
-MIRANDA_ARGS = MIRANDA_MAP = None
+MIRANDA_ARGS = MIRANDA_MAP = MIRANDA_FAIL = None
 
 def tieMirandaKnot():
     """
@@ -56,10 +56,13 @@ def tieMirandaKnot():
 
     global MIRANDA_ARGS
     global MIRANDA_MAP
+    global MIRANDA_FAIL
 
     from typhon.objects.collections.maps import ConstMap
+    from typhon.objects.data import StrObject
     MIRANDA_ARGS = makeMirandaArgs()
     MIRANDA_MAP = ConstMap(MIRANDA_ARGS)
+    MIRANDA_FAIL = StrObject(u"FAIL")
 
 
 mirandaAtoms = [
@@ -161,7 +164,9 @@ class Object(object):
 
         if namedArgsMap is None or namedArgsMap.isEmpty():
             namedArgsMap = MIRANDA_MAP
-        else:
+        elif not namedArgsMap.contains(MIRANDA_FAIL):
+            # FAIL is the only Miranda named argument, so if the caller
+            # already passed one, then there is nothing to merge.
             from typhon.objects.collections.maps import ConstMap
             namedArgsMap = ConstMap(namedArgsMap._or(MIRANDA_ARGS))
 
@@ -284,6 +284,8 @@ default_loop = rffi.llexternal("uv_default_loop", [], loop_tp,
 uv_run = rffi.llexternal("uv_run", [loop_tp, rffi.INT], rffi.INT,
                          compilation_info=eci)
 run = checking("run", uv_run)
+stop = rffi.llexternal("uv_stop", [loop_tp], lltype.Void,
+                       compilation_info=eci)
 now = rffi.llexternal("uv_now", [loop_tp], rffi.ULONGLONG,
                       compilation_info=eci)
 update_time = rffi.llexternal("uv_update_time", [loop_tp], lltype.Void,
@@ -372,6 +374,21 @@ is_closing = rffi.llexternal("uv_is_closing", [handle_tp], rffi.INT,
 def isClosing(handleish):
     rv = intmask(is_closing(rffi.cast(handle_tp, handleish)))
     return bool(rv)
+
+
+uv_unref = rffi.llexternal("uv_unref", [handle_tp], lltype.Void,
+                          compilation_info=eci)
+
+
+@specialize.ll()
+def unref(handleish):
+    """
+    Stop a handle from keeping its loop alive by itself.
+    """
+
+    uv_unref(rffi.cast(handle_tp, handleish))
+
+
 uv_close = rffi.llexternal(
     "uv_close", [handle_tp, close_cb], lltype.Void, compilation_info=eci)
 
@@ -411,22 +428,26 @@ prepare_init = rffi.llexternal("uv_prepare_init", [loop_tp, prepare_tp],
                                rffi.INT, compilation_info=eci)
 prepare_start = rffi.llexternal("uv_prepare_start", [prepare_tp, prepare_cb],
                                 rffi.INT, compilation_info=eci)
+prepareStart = checking("prepare_start", prepare_start)
 prepare_stop = rffi.llexternal("uv_prepare_stop", [prepare_tp],
                                rffi.INT, compilation_info=eci)
+prepareStop = checking("prepare_stop", prepare_stop)
 
 
-def alloc_prepare():
-    return lltype.malloc(cConfig["prepare_t"], flavor="raw", zero=True)
+def alloc_prepare(loop):
+    prepare = lltype.malloc(cConfig["prepare_t"], flavor="raw", zero=True)
+    check("prepare_init", prepare_init(loop, prepare))
+    return prepare
 
 
 idle_cb = rffi.CCallback([idle_tp], lltype.Void)
 
 idle_init = rffi.llexternal("uv_idle_init", [loop_tp, idle_tp], rffi.INT,
                             compilation_info=eci)
-idle_start = rffi.llexternal("uv_idle_start", [loop_tp, idle_tp], rffi.INT,
+idle_start = rffi.llexternal("uv_idle_start", [idle_tp, idle_cb], rffi.INT,
                              compilation_info=eci)
 idleStart = checking("idle_start", idle_start)
-idle_stop = rffi.llexternal("uv_idle_stop", [loop_tp], rffi.INT,
+idle_stop = rffi.llexternal("uv_idle_stop", [idle_tp], rffi.INT,
                             compilation_info=eci)
 idleStop = checking("idle_stop", idle_stop)
 
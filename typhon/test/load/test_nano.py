@@ -0,0 +1,107 @@
+from unittest import TestCase
+
+from rpython.rlib.rbigint import rbigint
+
+from typhon.load.nano import InvalidMAST, MASTStream, loadMASTBytes
+from typhon.nano.mast import MastIR
+
+
+def varint(i):
+    bs = ""
+    while True:
+        b = i & 0x7f
+        i >>= 7
+        if i:
+            bs += chr(b | 0x80)
+        else:
+            return bs + chr(b)
+
+
+def stream(bs):
+    return MASTStream(bs, False, u"<test>")
+
+
+class TestMASTStream(TestCase):
+
+    def testNextIntSmall(self):
+        s = stream(varint(0) + varint(127) + varint(300))
+        self.assertEqual(s.nextInt(), 0)
+        self.assertEqual(s.nextInt(), 127)
+        self.assertEqual(s.nextInt(), 300)
+        self.assertTrue(s.exhausted())
+
+    def testNextIntLargest(self):
+        s = stream(varint(2 ** 63 - 1))
+        self.assertEqual(s.nextInt(), 2 ** 63 - 1)
+
+    def testNextIntOverflow(self):
+        s = stream(varint(2 ** 63))
+        self.assertRaises(InvalidMAST, s.nextInt)
+
+    def testNextIntUnderrun(self):
+        s = stream("\x80")
+        self.assertRaises(InvalidMAST, s.nextInt)
+
+    def testNextSmallVarIntStopsBeforeOverflow(self):
+        acc, shift = stream(varint(2 ** 63)).nextSmallVarInt()
+        self.assertEqual(acc, 0)
+        self.assertEqual(shift, 63)
+
+    def testNextVarIntSmall(self):
+        s = stream(varint(300))
+        self.assertTrue(s.nextVarInt().eq(rbigint.fromint(300)))
+
+    def testNextVarIntBig(self):
+        i = 2 ** 100 + 12345
+        s = stream(varint(i))
+        self.assertTrue(s.nextVarInt().eq(rbigint.fromlong(i)))
+        self.assertTrue(s.exhausted())
+
+
+class TestLoadMASTBytes(TestCase):
+
+    def testNegativeInt(self):
+        # -42 zigzags to 83.
+        expr = loadMASTBytes("Mont\xe0MAST\x00LI" + varint(83))
+        self.assertTrue(isinstance(expr, MastIR.IntExpr))
+        self.assertEqual(expr.i.toint(), -42)
+
+
+SPAN = "B\x00\x00\x00\x00"
+
+# def x :Int := 42
+RECORDS = [
+    "LN" + SPAN,              # null
+    "N\x00" + SPAN,           # Int
+    "PF\x01\x01" + SPAN,      # x :Int
+    "LI\x54" + SPAN,          # 42
+    "D\x00\x00\x02" + SPAN,   # def x :Int := 42
+]
+
+
+def version2(records, exprs=4, patts=1):
+    strings = varint(2) + varint(3) + "Int" + varint(1) + "x"
+    counts = varint(exprs) + varint(patts)
+    return "Mont\xe0MAST\x02" + strings + counts + "".join(records)
+
+
+class TestLoadMASTVersion2(TestCase):
+
+    def testDef(self):
+        expr = loadMASTBytes(version2(RECORDS))
+        self.assertTrue(isinstance(expr, MastIR.DefExpr))
+        self.assertEqual(expr.patt.name, u"x")
+        self.assertEqual(expr.patt.guard.name, u"Int")
+
+    def testCountMismatch(self):
+        bs = version2(RECORDS, exprs=5)
+        self.assertRaises(InvalidMAST, loadMASTBytes, bs)
+
+    def testCountTooLarge(self):
+        bs = version2(RECORDS, exprs=2 ** 40)
+        self.assertRaises(InvalidMAST, loadMASTBytes, bs)
+
+    def testStringIndexOutOfBounds(self):
+        records = RECORDS[:1] + ["N\x02" + SPAN]
+        bs = version2(records, exprs=2, patts=0)
+        self.assertRaises(InvalidMAST, loadMASTBytes, bs)
@@ -0,0 +1,105 @@
+"""
+Fixtures for tests of expanded `switch` expressions.
+"""
+
+from typhon.atoms import getAtom
+from typhon.errors import Refused
+from typhon.nano.mix import NoLiteralsIR
+from typhon.objects.data import CharObject, IntObject, StrObject
+from typhon.objects.ejectors import throwStr
+from typhon.objects.equality import EQUAL, optSame
+from typhon.objects.guards import anyGuard
+from typhon.objects.root import Object
+from typhon.objects.slots import finalBinding
+from typhon.prelude import gs
+
+RUN_1 = getAtom(u"run", 1)
+RUN_2 = getAtom(u"run", 2)
+
+
+class MatchSame(Object):
+    """
+    A stand-in for the prelude's _matchSame.
+    """
+
+    def recv(self, atom, args):
+        if atom is RUN_1:
+            return SameMatcher(args[0])
+        raise Refused(self, atom, args)
+
+
+class SameMatcher(Object):
+
+    def __init__(self, value):
+        self.value = value
+
+    def recv(self, atom, args):
+        if atom is RUN_2:
+            if optSame(self.value, args[0]) is not EQUAL:
+                throwStr(args[1], u"Not the same")
+            return args[0]
+        raise Refused(self, atom, args)
+
+
+class registeredMatchSame(object):
+    """
+    Register a _matchSame global for the duration of a test.
+    """
+
+    def __enter__(self):
+        self.old = gs.get(u"_matchSame", None)
+        self.matchSame = MatchSame()
+        gs[u"_matchSame"] = finalBinding(self.matchSame, anyGuard)
+        return self.matchSame
+
+    def __exit__(self, *args):
+        if self.old is None:
+            del gs[u"_matchSame"]
+        else:
+            gs[u"_matchSame"] = self.old
+
+
+def sameCase(matchSame, value, index, body, failure, ejector=None,
+             catchPatt=None):
+    """
+    One level of an expanded switch on the specimen in local 0.
+
+    The ejector and failure of level `index` live in locals 2 * index + 1
+    and 2 * index + 2.
+    """
+
+    ej = 2 * index + 1
+    if ejector is None:
+        ejector = NoLiteralsIR.LocalExpr(u"ej", ej, None)
+    if catchPatt is None:
+        catchPatt = NoLiteralsIR.NounPatt(u"failure", NoLiteralsIR.NullExpr(None),
+                                          ej + 1, None)
+    trans = NoLiteralsIR.CallExpr(NoLiteralsIR.LiveExpr(matchSame, None),
+                                  RUN_1, [NoLiteralsIR.LiveExpr(value, None)],
+                                  [], None)
+    patt = NoLiteralsIR.ViaPatt(trans,
+                                NoLiteralsIR.IgnorePatt(NoLiteralsIR.NullExpr(None),
+                                                        None), None)
+    defExpr = NoLiteralsIR.DefExpr(patt, ejector,
+                                   NoLiteralsIR.LocalExpr(u"specimen", 0, None),
+                                   None)
+    return NoLiteralsIR.EscapeExpr(
+        NoLiteralsIR.NounPatt(u"ej", NoLiteralsIR.NullExpr(None), ej, None),
+        NoLiteralsIR.SeqExpr([defExpr, body], None),
+        catchPatt, failure, None)
+
+
+def switchChain(matchSame, values, tail):
+    """
+    An expanded switch with a `match ==value` case for each value, each
+    returning its own index.
+    """
+
+    expr = tail
+    for i in reversed(range(len(values))):
+        expr = sameCase(matchSame, values[i], i,
+                        NoLiteralsIR.LiveExpr(IntObject(i), None), expr)
+    return expr
+
+
+CASES = [IntObject(1), StrObject(u"two"), CharObject(u'3'), IntObject(1)]
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from typhon.nano.escapes import LocalEscapesIR, LocalizeEjectors
+from typhon.nano.scopes import BoundNounsIR as ir
+
+
+def escape(*exprs):
+    patt = ir.NounPatt(u"ej", ir.NullExpr(None), 0, None)
+    return ir.EscapeOnlyExpr(patt, ir.SeqExpr(list(exprs), None), None)
+
+def fire(*args):
+    return ir.CallExpr(ir.LocalExpr(u"ej", 0, None), u"run", list(args), [],
+                       None)
+
+
+class TestLocalizeEjectors(TestCase):
+
+    def testLocalize(self):
+        ast = escape(fire(ir.StrExpr(u"hi", None)), ir.NullExpr(None))
+        ast = LocalizeEjectors().visitExpr(ast)
+        self.assertTrue(isinstance(ast, LocalEscapesIR.LocalEscapeOnlyExpr))
+        eject = ast.body.exprs[0]
+        self.assertTrue(isinstance(eject, LocalEscapesIR.LocalEjectExpr))
+        self.assertEqual(eject.index, 0)
+
+    def testLocalizeNoArgs(self):
+        ast = LocalizeEjectors().visitExpr(escape(fire()))
+        eject = ast.body.exprs[0]
+        self.assertTrue(isinstance(eject.value, LocalEscapesIR.NullExpr))
+
+    def testEscapingEjector(self):
+        other = ir.LocalExpr(u"f", 1, None)
+        leak = ir.CallExpr(other, u"run", [ir.LocalExpr(u"ej", 0, None)], [],
+                           None)
+        ast = LocalizeEjectors().visitExpr(escape(leak))
+        self.assertTrue(isinstance(ast, LocalEscapesIR.EscapeOnlyExpr))
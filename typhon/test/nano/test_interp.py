@@ -0,0 +1,232 @@
+from unittest import TestCase
+
+from typhon.atoms import getAtom
+from typhon.nano.interp import (Evaluator, MakeProfileNames,
+                                ProfileNameIR as ir, switchStart)
+from typhon.objects.collections.lists import unwrapList
+from typhon.objects.collections.maps import unwrapMap
+from typhon.objects.ejectors import theThrower
+from typhon.objects.root import Object
+from typhon.objects.data import (CharObject, DoubleObject, IntObject,
+                                 StrObject)
+from typhon.test.nano.switches import (CASES, registeredMatchSame,
+                                       switchChain)
+
+
+class TestSwitchStart(TestCase):
+
+    def testHits(self):
+        ints = {1: 0, 2: 1}
+        strs = {u"three": 2}
+        chars = {u"c": 3}
+        self.assertEqual(switchStart(IntObject(2), ints, strs, chars), 1)
+        self.assertEqual(switchStart(StrObject(u"three"), ints, strs, chars),
+                         2)
+        self.assertEqual(switchStart(CharObject(u"c"), ints, strs, chars), 3)
+
+    def testMissStartsAtTop(self):
+        self.assertEqual(switchStart(IntObject(7), {1: 1}, {}, {}), 0)
+        self.assertEqual(switchStart(StrObject(u"1"), {1: 1}, {}, {}), 0)
+
+
+class SwitchFailed(Object):
+    """
+    A stand-in for _switchFailed which remembers its arguments.
+    """
+
+    args = None
+
+    def callAtom(self, atom, args, namedArgs=None, span=None):
+        self.args = args
+        return StrObject(u"failed")
+
+
+def runSwitch(specimen, switchFailed):
+    from typhon.nano.mix import (DischargeAuditors, ElideGuards, NoLiteralsIR,
+                                 SpecializeCalls, SplitAuditors)
+    # The specimen is local 0, and each case has an ejector and a failure.
+    failures = [NoLiteralsIR.LocalExpr(u"failure", 2 * i + 2, None)
+                for i in range(len(CASES))]
+    tail = NoLiteralsIR.CallExpr(
+        NoLiteralsIR.LiveExpr(switchFailed, None),
+        getAtom(u"run", len(failures) + 1),
+        [NoLiteralsIR.LocalExpr(u"specimen", 0, None)] + failures, [], None)
+    with registeredMatchSame() as matchSame:
+        expr = NoLiteralsIR.SeqExpr([
+            NoLiteralsIR.DefExpr(
+                NoLiteralsIR.NounPatt(u"specimen",
+                                      NoLiteralsIR.NullExpr(None), 0, None),
+                NoLiteralsIR.NullExpr(None),
+                NoLiteralsIR.LiveExpr(specimen, None), None),
+            switchChain(matchSame, CASES, tail),
+        ], None)
+        ast = SpecializeCalls().visitExpr(expr)
+        ast = SplitAuditors().visitExpr(ast)
+        ast = DischargeAuditors().visitExpr(ast)
+        ast = ElideGuards().visitExpr(ast)
+        ast = MakeProfileNames().visitExpr(ast)
+        assert isinstance(ast.exprs[1], ir.SwitchExpr)
+        return Evaluator([], 2 * len(CASES) + 1).visitExpr(ast)
+
+
+class TestSwitchExpr(TestCase):
+
+    def testHits(self):
+        switchFailed = SwitchFailed()
+        self.assertEqual(runSwitch(IntObject(1), switchFailed).getInt(), 0)
+        self.assertEqual(runSwitch(StrObject(u"two"), switchFailed).getInt(),
+                         1)
+        self.assertEqual(runSwitch(CharObject(u'3'), switchFailed).getInt(),
+                         2)
+        self.assertTrue(switchFailed.args is None)
+
+    def testMissBindsEveryFailure(self):
+        switchFailed = SwitchFailed()
+        result = runSwitch(IntObject(7), switchFailed)
+        self.assertEqual(result._s, u"failed")
+        self.assertEqual(switchFailed.args[0].getInt(), 7)
+        failures = switchFailed.args[1:]
+        self.assertEqual(len(failures), len(CASES))
+        for failure in failures:
+            self.assertEqual(failure._s, u"Not the same")
+
+    def testMixedTypesMiss(self):
+        # Neither a Str nor a Double is the same as the Int case.
+        for specimen in [StrObject(u"1"), DoubleObject(1.0), CharObject(u'1')]:
+            switchFailed = SwitchFailed()
+            self.assertEqual(runSwitch(specimen, switchFailed)._s, u"failed")
+            self.assertEqual(len(switchFailed.args), len(CASES) + 1)
+
+
+class CallRecorder(Object):
+
+    atom = args = namedArgs = None
+
+    def callAtom(self, atom, args, namedArgs=None, span=None):
+        self.atom = atom
+        self.args = args
+        self.namedArgs = namedArgs
+        return StrObject(u"recorded")
+
+
+class TestCallExpr(TestCase):
+
+    def testNamedArgsIncludeFail(self):
+        rcvr = CallRecorder()
+        key = ir.LiveExpr(StrObject(u"key"), None)
+        value = ir.LiveExpr(IntObject(5), None)
+        call = ir.CallExpr(ir.LiveExpr(rcvr, None), getAtom(u"run", 0), [],
+                           [ir.NamedArgExpr(key, value, None)], None)
+        Evaluator([], 0).visitExpr(call)
+        d = unwrapMap(rcvr.namedArgs)
+        self.assertEqual([k._s for k in d.keys()], [u"key", u"FAIL"])
+        self.assertTrue(d[StrObject(u"FAIL")] is theThrower)
+
+
+class TestForwardTarget(TestCase):
+
+    def forward(self, index, target):
+        from typhon.scopes.safe import MObject
+        patt = ir.NounPatt(u"message", ir.NullExpr(None), 0, None)
+        call = ir.CallExpr(ir.LiveExpr(MObject(), None),
+                           getAtom(u"callWithMessage", 2),
+                           [target, ir.LocalExpr(u"message", index, None)],
+                           [], None)
+        return MakeProfileNames().forwardTarget(patt, call)
+
+    def testForwarder(self):
+        target = ir.FrameExpr(u"target", 0, None)
+        self.assertTrue(self.forward(0, target) is target)
+
+    def testOtherMessage(self):
+        target = ir.FrameExpr(u"target", 0, None)
+        self.assertTrue(self.forward(1, target) is None)
+
+    def testLocalTarget(self):
+        target = ir.LocalExpr(u"target", 1, None)
+        self.assertTrue(self.forward(0, target) is None)
+
+
+class TestMatchers(TestCase):
+
+    def interp(self, matchers, frame=[]):
+        from typhon.nano.interp import InterpObject
+        script = ir.ScriptExpr(u"o", None, None, None, [], [], matchers, {},
+                               None)
+        return InterpObject(u"o", script, frame, u"o")
+
+    def matcher(self, patt, body, localSize, forward=None):
+        return ir.MatcherExpr("matcher", patt, body, localSize, forward, None)
+
+    def noun(self, name, index, guard=None):
+        if guard is None:
+            guard = ir.NullExpr(None)
+        return ir.NounPatt(name, guard, index, None)
+
+    def recordParts(self, recorder, guard=None):
+        # match [verb, args, namedArgs] { recorder(verb, args, namedArgs) }
+        patt = ir.ListPatt([self.noun(u"verb", 0, guard),
+                            self.noun(u"args", 1), self.noun(u"namedArgs", 2)],
+                           None)
+        body = ir.CallExpr(ir.LiveExpr(recorder, None), getAtom(u"run", 3),
+                           [ir.LocalExpr(u"verb", 0, None),
+                            ir.LocalExpr(u"args", 1, None),
+                            ir.LocalExpr(u"namedArgs", 2, None)], [], None)
+        return self.matcher(patt, body, 3)
+
+    def namedArgs(self):
+        from typhon.objects.collections.maps import ConstMap, monteMap
+        d = monteMap()
+        d[StrObject(u"key")] = IntObject(5)
+        return ConstMap(d)
+
+    def testForwardDelivers(self):
+        target = CallRecorder()
+        forward = ir.FrameExpr(u"target", 0, None)
+        matcher = self.matcher(self.noun(u"message", 0), ir.NullExpr(None), 1,
+                               forward)
+        obj = self.interp([matcher], [target])
+        namedArgs = self.namedArgs()
+        atom = getAtom(u"greet", 1)
+        result = obj.recvNamed(atom, [IntObject(1)], namedArgs)
+        self.assertEqual(result._s, u"recorded")
+        self.assertTrue(target.atom is atom)
+        self.assertEqual(target.args[0].getInt(), 1)
+        self.assertTrue(target.namedArgs is namedArgs)
+
+    def testListPattBindsParts(self):
+        recorder = CallRecorder()
+        obj = self.interp([self.recordParts(recorder)])
+        namedArgs = self.namedArgs()
+        obj.recvNamed(getAtom(u"greet", 2), [IntObject(1), IntObject(2)],
+                      namedArgs)
+        verb, args, named = recorder.args
+        self.assertEqual(verb._s, u"greet")
+        self.assertEqual([arg.getInt() for arg in unwrapList(args)], [1, 2])
+        self.assertTrue(named is namedArgs)
+
+    def testMismatchFallsThrough(self):
+        from typhon.objects.guards import IntGuard
+        first = CallRecorder()
+        second = CallRecorder()
+        # The verb is a Str, so the first matcher's guard fails.
+        guarded = self.recordParts(first, ir.LiveExpr(IntGuard(), None))
+        obj = self.interp([guarded, self.recordParts(second)])
+        obj.recvNamed(getAtom(u"greet", 0), [], self.namedArgs())
+        self.assertTrue(first.args is None)
+        self.assertEqual(second.args[0]._s, u"greet")
+
+    def testMismatchRefuses(self):
+        from typhon.errors import Refused
+        from typhon.objects.guards import IntGuard
+        recorder = CallRecorder()
+        guarded = self.recordParts(recorder, ir.LiveExpr(IntGuard(), None))
+        # A two-element list pattern can never match a message.
+        short = self.matcher(ir.ListPatt([self.noun(u"verb", 0),
+                                          self.noun(u"args", 1)], None),
+                             ir.NullExpr(None), 2)
+        obj = self.interp([guarded, short])
+        self.assertRaises(Refused, obj.recvNamed, getAtom(u"greet", 0), [],
+                          self.namedArgs())
+        self.assertTrue(recorder.args is None)
+
@@ -0,0 +1,212 @@
+from unittest import TestCase
+
+from typhon.atoms import getAtom
+from typhon.nano.mix import (ElideGuards, MixIR, NoLiteralsIR,
+                             SpecializeCalls, StampedScriptIR as ir)
+from typhon.objects.constants import FalseObject, TrueObject
+from typhon.objects.data import IntObject, StrObject
+from typhon.objects.guards import IntGuard
+from typhon.test.nano.switches import (CASES, registeredMatchSame, sameCase,
+                                       switchChain)
+
+
+def defInt(rvalue):
+    guard = ir.LiveExpr(IntGuard(), None)
+    patt = ir.NounPatt(u"x", guard, 0, None)
+    return ir.DefExpr(patt, ir.NullExpr(None), rvalue, None)
+
+
+class TestElideGuards(TestCase):
+
+    def testElideLiteral(self):
+        ast = ElideGuards().visitExpr(defInt(ir.LiveExpr(IntObject(5), None)))
+        self.assertTrue(isinstance(ast.patt.guard, ir.NullExpr))
+
+    def testKeepMismatch(self):
+        ast = ElideGuards().visitExpr(defInt(ir.LiveExpr(StrObject(u"5"),
+                                                         None)))
+        self.assertTrue(isinstance(ast.patt.guard, ir.LiveExpr))
+
+    def testElideBuiltinResult(self):
+        call = ir.CallExpr(ir.LiveExpr(IntObject(-5), None),
+                           getAtom(u"abs", 0), [], [], None)
+        ast = ElideGuards().visitExpr(defInt(call))
+        self.assertTrue(isinstance(ast.patt.guard, ir.NullExpr))
+
+    def testElideGuardedLocal(self):
+        first = defInt(ir.LiveExpr(StrObject(u"5"), None))
+        second = defInt(ir.LocalExpr(u"x", 0, None))
+        second = ir.DefExpr(ir.NounPatt(u"y", second.patt.guard, 1, None),
+                            second.ex, second.rvalue, None)
+        ast = ElideGuards().visitExpr(ir.SeqExpr([first, second], None))
+        # The first guard must run, but then x is known to be an Int.
+        self.assertTrue(isinstance(ast.exprs[0].patt.guard, ir.LiveExpr))
+        self.assertTrue(isinstance(ast.exprs[1].patt.guard, ir.NullExpr))
+
+
+class TestInlineCall(TestCase):
+
+    def target(self, body, matchers=[]):
+        from typhon.nano.interp import InterpObject, ProfileNameIR as pir
+        atom = getAtom(u"run", 1)
+        patt = pir.NounPatt(u"x", pir.NullExpr(None), 0, None)
+        method = pir.MethodExpr("run", None, atom, [patt], [],
+                                pir.NullExpr(None), body, 1, None)
+        script = pir.ScriptExpr(u"f", None, None, None, [], [method],
+                                matchers, {atom: method}, None)
+        return InterpObject(u"f", script, [IntObject(7)], u"f")
+
+    def addOne(self):
+        from typhon.nano.interp import ProfileNameIR as pir
+        return pir.CallExpr(pir.LocalExpr(u"x", 0, None), getAtom(u"add", 1),
+                            [pir.FrameExpr(u"one", 0, None)], [], None)
+
+    def testInline(self):
+        sc = SpecializeCalls()
+        sc.localSizes.append(3)
+        arg = MixIR.LocalExpr(u"y", 0, None)
+        ast = sc.inlineCall(self.target(self.addOne()), getAtom(u"run", 1),
+                            [arg], None)
+        # The argument is bound past the caller's locals.
+        self.assertEqual(ast.exprs[0].patt.index, 3)
+        self.assertTrue(ast.exprs[0].rvalue is arg)
+        inlined = ast.exprs[1]
+        self.assertEqual(inlined.params, [3])
+        self.assertEqual(inlined.body.obj.index, 3)
+        # The frame is read at compile time.
+        self.assertEqual(inlined.body.args[0].obj.getInt(), 7)
+        self.assertEqual(sc.localSizes, [4])
+
+    def testMatchers(self):
+        sc = SpecializeCalls()
+        sc.localSizes.append(0)
+        target = self.target(self.addOne(), matchers=[None])
+        self.assertTrue(sc.inlineCall(target, getAtom(u"run", 1),
+                                      [MixIR.NullExpr(None)], None) is None)
+
+    def testTooBig(self):
+        from typhon.nano.interp import ProfileNameIR as pir
+        sc = SpecializeCalls()
+        sc.localSizes.append(0)
+        body = pir.SeqExpr([self.addOne() for _ in range(10)], None)
+        self.assertTrue(sc.inlineCall(self.target(body), getAtom(u"run", 1),
+                                      [MixIR.NullExpr(None)], None) is None)
+        self.assertEqual(sc.localSizes, [0])
+
+
+class TestFolding(TestCase):
+
+    def live(self, obj):
+        return NoLiteralsIR.LiveExpr(obj, None)
+
+    def testFoldPure(self):
+        call = NoLiteralsIR.CallExpr(self.live(IntObject(1)),
+                                     getAtom(u"shiftLeft", 1),
+                                     [self.live(IntObject(8))], [], None)
+        ast = SpecializeCalls().visitExpr(call)
+        self.assertEqual(ast.obj.getInt(), 256)
+
+    def testFoldFailure(self):
+        call = NoLiteralsIR.CallExpr(self.live(IntObject(1)),
+                                     getAtom(u"floorDivide", 1),
+                                     [self.live(IntObject(0))], [], None)
+        ast = SpecializeCalls().visitExpr(call)
+        self.assertTrue(isinstance(ast, MixIR.ExceptionExpr))
+
+    def testKeepNonLiteral(self):
+        call = NoLiteralsIR.CallExpr(self.live(IntObject(1)),
+                                     getAtom(u"add", 1),
+                                     [NoLiteralsIR.LocalExpr(u"x", 0, None)],
+                                     [], None)
+        ast = SpecializeCalls().visitExpr(call)
+        self.assertTrue(isinstance(ast, MixIR.CallExpr))
+
+    def testPick(self):
+        call = NoLiteralsIR.CallExpr(self.live(FalseObject),
+                                     getAtom(u"pick", 2),
+                                     [NoLiteralsIR.LocalExpr(u"x", 0, None),
+                                      NoLiteralsIR.LocalExpr(u"y", 1, None)],
+                                     [], None)
+        ast = SpecializeCalls().visitExpr(call)
+        self.assertEqual(ast.index, 1)
+
+    def testPruneIf(self):
+        expr = NoLiteralsIR.IfExpr(self.live(TrueObject),
+                                   self.live(IntObject(1)),
+                                   self.live(IntObject(2)), None)
+        ast = SpecializeCalls().visitExpr(expr)
+        self.assertEqual(ast.obj.getInt(), 1)
+
+    def testFlattenSeq(self):
+        local = NoLiteralsIR.LocalExpr(u"x", 0, None)
+        inner = NoLiteralsIR.SeqExpr([self.live(IntObject(1)), local], None)
+        expr = NoLiteralsIR.SeqExpr([inner, self.live(IntObject(2))], None)
+        ast = SpecializeCalls().visitExpr(expr)
+        self.assertEqual(ast.obj.getInt(), 2)
+
+
+class TestSwitch(TestCase):
+
+    def testJumpTable(self):
+        with registeredMatchSame() as matchSame:
+            chain = switchChain(matchSame, CASES, NoLiteralsIR.NullExpr(None))
+            ast = SpecializeCalls().visitExpr(chain)
+        self.assertTrue(isinstance(ast, MixIR.SwitchExpr))
+        self.assertEqual(len(ast.levels), 4)
+        # The earlier case wins for a repeated value.
+        self.assertEqual(ast.intCases, {1: 0})
+        self.assertEqual(ast.strCases, {u"two": 1})
+        self.assertEqual(ast.charCases, {u'3': 2})
+
+    def testSameCase(self):
+        with registeredMatchSame() as matchSame:
+            case = sameCase(matchSame, IntObject(5), 0,
+                            NoLiteralsIR.NullExpr(None),
+                            NoLiteralsIR.NullExpr(None))
+            self.assertEqual(SpecializeCalls().sameCase(case, 0).getInt(), 5)
+            self.assertTrue(SpecializeCalls().sameCase(case, 7) is None)
+
+    def testForeignEjector(self):
+        other = NoLiteralsIR.LocalExpr(u"otherEj", 9, None)
+        with registeredMatchSame() as matchSame:
+            tail = sameCase(matchSame, IntObject(2), 1,
+                            NoLiteralsIR.NullExpr(None),
+                            NoLiteralsIR.NullExpr(None))
+            chain = sameCase(matchSame, IntObject(1), 0,
+                             NoLiteralsIR.NullExpr(None), tail, ejector=other)
+            self.assertTrue(SpecializeCalls().sameCase(chain, 0) is None)
+            ast = SpecializeCalls().visitExpr(chain)
+        self.assertTrue(isinstance(ast, MixIR.EscapeExpr))
+
+    def testEjectorUsedInBody(self):
+        ej = NoLiteralsIR.LocalExpr(u"ej", 1, None)
+        with registeredMatchSame() as matchSame:
+            case = sameCase(matchSame, IntObject(1), 0, ej,
+                            NoLiteralsIR.NullExpr(None))
+            self.assertTrue(SpecializeCalls().sameCase(case, 0) is None)
+
+    def testGuardedCatch(self):
+        guard = NoLiteralsIR.LiveExpr(IntGuard(), None)
+        catchPatt = NoLiteralsIR.NounPatt(u"failure", guard, 2, None)
+        with registeredMatchSame() as matchSame:
+            case = sameCase(matchSame, IntObject(1), 0,
+                            NoLiteralsIR.NullExpr(None),
+                            NoLiteralsIR.NullExpr(None), catchPatt=catchPatt)
+            self.assertTrue(SpecializeCalls().sameCase(case, 0) is None)
+
+    def testEarlierFailureStopsTable(self):
+        # The third case reads the first case's failure, so it must run
+        # after the first case has failed.
+        failure = NoLiteralsIR.LocalExpr(u"failure", 2, None)
+        with registeredMatchSame() as matchSame:
+            third = sameCase(matchSame, IntObject(3), 2, failure,
+                             NoLiteralsIR.NullExpr(None))
+            second = sameCase(matchSame, IntObject(2), 1,
+                              NoLiteralsIR.NullExpr(None), third)
+            first = sameCase(matchSame, IntObject(1), 0,
+                             NoLiteralsIR.NullExpr(None), second)
+            ast = SpecializeCalls().visitExpr(first)
+        self.assertTrue(isinstance(ast, MixIR.SwitchExpr))
+        self.assertEqual(len(ast.levels), 2)
+        self.assertEqual(ast.intCases, {1: 0, 2: 1})
+        self.assertTrue(isinstance(ast.tail, MixIR.EscapeExpr))
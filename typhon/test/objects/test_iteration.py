@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from typhon.objects.collections.helpers import monteMap, monteSet
+from typhon.objects.collections.lists import ConstList, wrapList
+from typhon.objects.collections.maps import ConstMap
+from typhon.objects.collections.sets import ConstSet
+from typhon.objects.data import (BytesObject, CharObject, IntObject,
+                                 StrObject)
+from typhon.objects.iteration import fastLoop
+
+
+class Consumer(object):
+
+    def __init__(self):
+        self.seen = []
+
+    def runMethod(self, method, args, namedArgs):
+        self.seen.append(args)
+
+
+class TestFastLoop(TestCase):
+
+    def loop(self, iterable):
+        consumer = Consumer()
+        self.assertTrue(fastLoop(iterable, consumer, None, "test"))
+        return consumer.seen
+
+    def testConstList(self):
+        seen = self.loop(ConstList([StrObject(u"a"), StrObject(u"b")]))
+        self.assertEqual([(k.getInt(), v._s) for k, v in seen],
+                         [(0, u"a"), (1, u"b")])
+
+    def testFlexList(self):
+        flex = wrapList([IntObject(5)]).call(u"diverge", [])
+        seen = self.loop(flex)
+        self.assertEqual([(k.getInt(), v.getInt()) for k, v in seen],
+                         [(0, 5)])
+
+    def testConstMap(self):
+        d = monteMap()
+        d[IntObject(1)] = StrObject(u"one")
+        d[IntObject(2)] = StrObject(u"two")
+        seen = self.loop(ConstMap(d))
+        self.assertEqual([(k.getInt(), v._s) for k, v in seen],
+                         [(1, u"one"), (2, u"two")])
+
+    def testConstSet(self):
+        s = monteSet()
+        s[CharObject(u"x")] = None
+        seen = self.loop(ConstSet(s))
+        self.assertEqual([(k.getInt(), v._c) for k, v in seen],
+                         [(0, u"x")])
+
+    def testStr(self):
+        seen = self.loop(StrObject(u"hi"))
+        self.assertEqual([(k.getInt(), v._c) for k, v in seen],
+                         [(0, u"h"), (1, u"i")])
+
+    def testBytes(self):
+        seen = self.loop(BytesObject("AB"))
+        self.assertEqual([(k.getInt(), v.getInt()) for k, v in seen],
+                         [(0, 65), (1, 66)])
+
+    def testOther(self):
+        self.assertFalse(fastLoop(IntObject(5), Consumer(), None, "test"))
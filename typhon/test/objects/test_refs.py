@@ -14,12 +14,13 @@
 
 from unittest import TestCase
 
-from typhon.objects.collections.lists import wrapList, unwrapList
+from typhon.objects.collections.lists import FlexList, wrapList, unwrapList
 from typhon.objects.collections.maps import ConstMap, unwrapMap
 from typhon.objects.constants import unwrapBool, wrapBool
 from typhon.objects.data import (DoubleObject, IntObject, promoteToDouble,
                                  unwrapInt)
-from typhon.objects.refs import isResolved, makePromise, resolution
+from typhon.objects.refs import (LocalVatRef, isResolved, makePromise,
+                                 packLocalRef, resolution)
 from typhon.vats import scopedVat, testingVat
 
 
@@ -88,3 +89,25 @@ class TestUnwrappers(TestCase):
         with scopedVat(testingVat()):
             p = makeNear(ConstMap({}))
             self.assertEqual(unwrapMap(p).items(), [])
+
+
+class TestPackLocalRef(TestCase):
+
+    def testShareDeepFrozen(self):
+        i = IntObject(42)
+        self.assertTrue(packLocalRef(i, testingVat(), testingVat()) is i)
+
+    def testShareFrozenList(self):
+        l = wrapList([IntObject(1), wrapList([DoubleObject(2.0)])])
+        self.assertTrue(packLocalRef(l, testingVat(), testingVat()) is l)
+
+    def testWrapMutable(self):
+        l = wrapList([FlexList([])])
+        ref = packLocalRef(l, testingVat(), testingVat())
+        self.assertTrue(isinstance(ref, LocalVatRef))
+
+    def testWrapPromise(self):
+        with scopedVat(testingVat()):
+            p, r = makePromise()
+            ref = packLocalRef(p, testingVat(), testingVat())
+            self.assertTrue(isinstance(ref, LocalVatRef))
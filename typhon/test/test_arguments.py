@@ -0,0 +1,23 @@
+from unittest import TestCase
+
+from typhon.arguments import BadArguments, Configuration
+
+
+class TestConfiguration(TestCase):
+
+    def testTurnSlice(self):
+        config = Configuration(["typhon", "-turn-slice", "20", "script"])
+        self.assertEqual(config.turnSlice, 20)
+        self.assertEqual(config.argv, ["typhon", "script"])
+
+    def testTurnSliceNotANumber(self):
+        self.assertRaises(BadArguments, Configuration,
+                          ["typhon", "-turn-slice", "abc"])
+
+    def testTurnSliceZero(self):
+        self.assertRaises(BadArguments, Configuration,
+                          ["typhon", "-turn-slice", "0"])
+
+    def testTurnSliceNegative(self):
+        self.assertRaises(BadArguments, Configuration,
+                          ["typhon", "-turn-slice", "-5"])
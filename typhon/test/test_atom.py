@@ -27,3 +27,9 @@ class TestAtom(TestCase):
         first = getAtom(u"test", 5)
         second = getAtom(u"test", 5)
         self.assertTrue(first is second)
+
+    def testIndexDistinct(self):
+        first = getAtom(u"test", 5)
+        second = getAtom(u"test", 6)
+        self.assertNotEqual(first.index, second.index)
+        self.assertEqual(getAtom(u"test", 5).index, first.index)
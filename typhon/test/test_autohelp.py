@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from typhon.atoms import getAtom
+from typhon.autohelp import autohelp, method
+from typhon.errors import Refused
+from typhon.objects.collections.maps import EMPTY_MAP
+from typhon.objects.data import IntObject
+from typhon.objects.root import Object
+
+# Enough methods to have tripped the old 42-clause limit on recvNamed().
+METHODS = 50
+
+
+def constant(i):
+    @method("Int", _verb="m%d" % i)
+    def f(self):
+        return i
+    return f
+
+
+def makeMany():
+    attrs = {}
+    for i in range(METHODS):
+        attrs["m%d" % i] = constant(i)
+
+    @method("Int", "Int")
+    def add(self, i):
+        return i + 1
+
+    attrs["add"] = add
+    return autohelp(type("Many", (Object,), attrs))
+
+Many = makeMany()
+
+
+class TestAutohelp(TestCase):
+
+    def testManyMethods(self):
+        obj = Many()
+        for i in range(METHODS):
+            result = obj.recvNamed(getAtom(u"m%d" % i, 0), [], EMPTY_MAP)
+            self.assertEqual(result.getInt(), i)
+
+    def testArguments(self):
+        obj = Many()
+        result = obj.recvNamed(getAtom(u"add", 1), [IntObject(41)],
+                               EMPTY_MAP)
+        self.assertEqual(result.getInt(), 42)
+
+    def testRespondingAtoms(self):
+        atoms = Many().respondingAtoms()
+        self.assertEqual(len(atoms), METHODS + 1)
+        self.assertTrue(getAtom(u"m%d" % (METHODS - 1), 0) in atoms)
+
+    def testRefusesUnknownVerb(self):
+        self.assertRaises(Refused, Many().recvNamed,
+                          getAtom(u"m%d" % METHODS, 0), [], EMPTY_MAP)
+
+    def testRefusesWrongArity(self):
+        self.assertRaises(Refused, Many().recvNamed, getAtom(u"m0", 1),
+                          [IntObject(0)], EMPTY_MAP)
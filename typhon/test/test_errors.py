@@ -0,0 +1,16 @@
+from unittest import TestCase
+
+from typhon.atoms import getAtom
+from typhon.errors import userError
+from typhon.objects.constants import NullObject
+
+
+class TestUserException(TestCase):
+
+    def testTrailOrder(self):
+        ue = userError(u"test")
+        ue.addTrail(NullObject, getAtom(u"inner", 0), [], None)
+        ue.addTrail(NullObject, getAtom(u"outer", 0), [], None)
+        trail = ue.formatTrail()
+        self.assertTrue(u".inner()" in trail[0])
+        self.assertTrue(u".outer()" in trail[2])
@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from typhon.importing import AstModule
+from typhon.metrics import globalRecorder
+from typhon.nano.interp import scopeKey
+from typhon.objects.data import IntObject
+from typhon.objects.guards import anyGuard
+from typhon.objects.slots import finalBinding
+
+
+class TestAstModule(TestCase):
+
+    def testPipelineCached(self):
+        module = AstModule(globalRecorder(), u"test")
+        # The noun `x`.
+        module.load("Mont\xe0MAST\x00N\x01x")
+        for i in range(3):
+            env = {u"x": finalBinding(IntObject(i), anyGuard)}
+            self.assertEqual(module.eval(env)[0].getInt(), i)
+        self.assertEqual(len(module.pipelineCache), 1)
+
+    def testScopeKeyUnordered(self):
+        self.assertEqual(scopeKey([u"a", u"b"]), scopeKey([u"b", u"a"]))
+        self.assertNotEqual(scopeKey([u"a"]), scopeKey([u"a", u"b"]))
+
+    def testScopeKeySpaces(self):
+        # Nouns may contain spaces, as in ::"a b".
+        self.assertNotEqual(scopeKey([u"a b"]), scopeKey([u"a", u"b"]))
+        self.assertNotEqual(scopeKey([u"1:a"]), scopeKey([u"a"]))
@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from typhon.metrics import Histogram
+
+
+class TestHistogram(TestCase):
+
+    def testEmpty(self):
+        h = Histogram()
+        self.assertEqual(h.mean(), 0.0)
+        self.assertEqual(h.quantile(0.5), 0.0)
+
+    def testBuckets(self):
+        h = Histogram()
+        # Zero, 3us, and 1ms.
+        h.observe(0.0)
+        h.observe(0.000003)
+        h.observe(0.001)
+        self.assertEqual(h.count, 3)
+        self.assertEqual(h.buckets[0], 1)
+        self.assertEqual(h.buckets[2], 1)
+        self.assertEqual(h.buckets[10], 1)
+        self.assertEqual(h.maximum, 0.001)
+
+    def testQuantile(self):
+        h = Histogram()
+        for _ in range(99):
+            h.observe(0.000003)
+        h.observe(1.0)
+        self.assertEqual(h.quantile(0.5), 0.000004)
+        self.assertEqual(h.quantile(1.0), 1.0)
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from typhon.vats import Vat, VatCheckpointed
+from typhon.vats import Turn, TurnQueue, Vat, VatCheckpointed, VatManager
 
 class TestVat(TestCase):
 
@@ -35,3 +35,214 @@ class TestVat(TestCase):
         v = Vat(None, None, name=u"test", checkpoints=2)
         # 2 isn't enough for a deduction of 3.
         self.assertRaises(VatCheckpointed, v.checkpoint, points=3)
+
+    def testTakeSomeTurnsRequeuesAfterError(self):
+        from typhon.atoms import getAtom
+        from typhon.objects.collections.maps import EMPTY_MAP
+        manager = VatManager()
+        v = Vat(manager, None, name=u"test", checkpoints=-1)
+        calls = []
+
+        class Explosive(object):
+            def callAtom(self, atom, args, namedArgs):
+                calls.append(args[0])
+                if args[0] == 1:
+                    v.sendOnly(self, atom, [3], namedArgs)
+                    raise ValueError("boom")
+
+        for i in range(3):
+            v.sendOnly(Explosive(), getAtom(u"run", 1), [i], EMPTY_MAP)
+        manager.takeReadyVats()
+        self.assertRaises(ValueError, v.takeSomeTurns)
+        self.assertEqual(calls, [0, 1])
+        # The rest of the batch is kept, ahead of the turn sent during it,
+        # and the vat is ready again.
+        self.assertEqual([t.args[0] for t in v._pending.asList()], [2, 3])
+        self.assertEqual(manager.takeReadyVats(), [v])
+        v.takeSomeTurns()
+        self.assertEqual(calls, [0, 1, 2, 3])
+
+    def testStatistics(self):
+        from typhon.atoms import getAtom
+        from typhon.objects.collections.maps import EMPTY_MAP
+        v = Vat(None, None, name=u"test", checkpoints=-1, timeTurns=True)
+
+        class Target(object):
+            def callAtom(self, atom, args, namedArgs):
+                pass
+
+        for _ in range(3):
+            v.sendOnly(Target(), getAtom(u"run", 0), [], EMPTY_MAP)
+        v.takeSomeTurns()
+        self.assertEqual(v.statistics.turns, 3)
+        self.assertEqual(v.statistics.queueHighWater, 3)
+        self.assertEqual(v.statistics.turnDurations.count, 3)
+        self.assertEqual(v.statistics.deliveryLatencies.count, 3)
+
+    def testStatisticsUntimed(self):
+        from typhon.atoms import getAtom
+        from typhon.objects.collections.maps import EMPTY_MAP
+        v = Vat(None, None, name=u"test", checkpoints=-1)
+
+        class Target(object):
+            def callAtom(self, atom, args, namedArgs):
+                pass
+
+        v.sendOnly(Target(), getAtom(u"run", 0), [], EMPTY_MAP)
+        self.assertEqual(v._pending.asList()[0].sentAt, 0.0)
+        v.takeSomeTurns()
+        # Turns are still counted, but the clock is never read.
+        self.assertEqual(v.statistics.turns, 1)
+        self.assertEqual(v.statistics.turnDurations.count, 0)
+        self.assertEqual(v.statistics.deliveryLatencies.count, 0)
+
+    def testSendOnlyDoesNotBuildFail(self):
+        from typhon.atoms import getAtom
+        from typhon.objects.collections.maps import EMPTY_MAP
+        v = Vat(None, None, name=u"test", checkpoints=-1)
+        seen = []
+
+        class Target(object):
+            def callAtom(self, atom, args, namedArgs):
+                seen.append(namedArgs)
+
+        v.sendOnly(Target(), getAtom(u"run", 0), [], EMPTY_MAP)
+        v.takeSomeTurns()
+        # The default Miranda FAIL is left for callAtom() to supply.
+        self.assertTrue(seen[0] is EMPTY_MAP)
+
+
+class TestTurnQueue(TestCase):
+
+    def turn(self, i):
+        return Turn(None, None, None, [i], None)
+
+    def testFIFO(self):
+        q = TurnQueue()
+        for i in range(3):
+            q.push(self.turn(i))
+        self.assertEqual([q.pop().args[0] for _ in range(3)], [0, 1, 2])
+        self.assertEqual(q.length(), 0)
+
+    def testPopEmpty(self):
+        q = TurnQueue()
+        self.assertRaises(IndexError, q.pop)
+
+    def testGrowAfterWrap(self):
+        q = TurnQueue(capacity=4)
+        for i in range(3):
+            q.push(self.turn(i))
+        # Move the head forward so that the ring wraps before growing.
+        q.pop()
+        q.pop()
+        for i in range(3, 10):
+            q.push(self.turn(i))
+        self.assertEqual([t.args[0] for t in q.asList()], range(2, 10))
+        self.assertEqual([q.pop().args[0] for _ in range(8)], range(2, 10))
+
+    def testTakeSomeTurnsDefersNewSends(self):
+        v = Vat(None, None, name=u"test", checkpoints=-1)
+        calls = []
+
+        class Recorder(object):
+            def callAtom(self, atom, args, namedArgs):
+                calls.append(args[0])
+                v.sendOnly(self, atom, [args[0] + 1], namedArgs)
+
+        from typhon.atoms import getAtom
+        from typhon.objects.collections.maps import EMPTY_MAP
+        v.sendOnly(Recorder(), getAtom(u"run", 1), [0], EMPTY_MAP)
+        v.takeSomeTurns()
+        self.assertEqual(calls, [0])
+        self.assertTrue(v.hasTurns())
+        v.takeSomeTurns()
+        self.assertEqual(calls, [0, 1])
+
+
+class TestVatManager(TestCase):
+
+    def testReadyQueue(self):
+        from typhon.atoms import getAtom
+        from typhon.objects.collections.maps import EMPTY_MAP
+        from typhon.objects.constants import NullObject
+        manager = VatManager()
+        first = Vat(manager, None, name=u"first", checkpoints=-1)
+        second = Vat(manager, None, name=u"second", checkpoints=-1)
+        manager.vats.extend([first, second])
+        self.assertFalse(manager.anyVatHasTurns())
+        second.sendOnly(NullObject, getAtom(u"run", 0), [], EMPTY_MAP)
+        first.sendOnly(NullObject, getAtom(u"run", 0), [], EMPTY_MAP)
+        second.sendOnly(NullObject, getAtom(u"run", 0), [], EMPTY_MAP)
+        self.assertTrue(manager.anyVatHasTurns())
+        # Each vat is queued once, in the order that it became ready.
+        self.assertEqual(manager.takeReadyVats(), [second, first])
+        self.assertFalse(manager.anyVatHasTurns())
+        first.sendOnly(NullObject, getAtom(u"run", 0), [], EMPTY_MAP)
+        self.assertEqual(manager.takeReadyVats(), [first])
+
+    def testTakeSliceDrains(self):
+        from typhon.atoms import getAtom
+        from typhon.objects.collections.maps import EMPTY_MAP
+        manager = VatManager()
+        v = Vat(manager, None, name=u"test", checkpoints=-1)
+        calls = []
+
+        class Countdown(object):
+            def callAtom(self, atom, args, namedArgs):
+                calls.append(args[0])
+                if args[0]:
+                    v.sendOnly(self, atom, [args[0] - 1], namedArgs)
+
+        v.sendOnly(Countdown(), getAtom(u"run", 1), [3], EMPTY_MAP)
+        # A far-off deadline lets every round run.
+        self.assertFalse(manager.takeSlice(float("inf")))
+        self.assertEqual(calls, [3, 2, 1, 0])
+
+    def testTakeSliceStopsAtDeadline(self):
+        from typhon.atoms import getAtom
+        from typhon.objects.collections.maps import EMPTY_MAP
+        manager = VatManager()
+        v = Vat(manager, None, name=u"test", checkpoints=-1)
+        calls = []
+
+        class Countdown(object):
+            def callAtom(self, atom, args, namedArgs):
+                calls.append(args[0])
+                if args[0]:
+                    v.sendOnly(self, atom, [args[0] - 1], namedArgs)
+
+        v.sendOnly(Countdown(), getAtom(u"run", 1), [3], EMPTY_MAP)
+        # A deadline in the past still allows one round.
+        self.assertTrue(manager.takeSlice(0.0))
+        self.assertEqual(calls, [3])
+        self.assertEqual(manager.takeReadyVats(), [v])
+
+
+class TestRunUntilDone(TestCase):
+
+    def testTurnExceptionReachesCaller(self):
+        from typhon import ruv
+        from typhon.atoms import getAtom
+        from typhon.metrics import Recorder
+        from typhon.objects.collections.maps import EMPTY_MAP
+        from typhon.vats import runUntilDone
+        uv_loop = ruv.alloc_loop()
+        manager = VatManager()
+        v = Vat(manager, uv_loop, name=u"test", checkpoints=-1)
+        manager.vats.append(v)
+        calls = []
+
+        class Explosive(object):
+            def callAtom(self, atom, args, namedArgs):
+                calls.append(args[0])
+                if args[0] == 1:
+                    raise ValueError("boom")
+
+        for i in range(3):
+            v.sendOnly(Explosive(), getAtom(u"run", 1), [i], EMPTY_MAP)
+        self.assertRaises(ValueError, runUntilDone, manager, uv_loop,
+                          Recorder(), 5)
+        # The reactor stopped; the last turn is still waiting.
+        self.assertEqual(calls, [0, 1])
+        self.assertEqual([t.args[0] for t in v._pending.asList()], [2])
+        ruv.loopClose(uv_loop)
@@ -13,13 +13,17 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from time import time
+
 from rpython.rlib.debug import debug_print
 from rpython.rlib.rthread import ThreadLocalReference, allocate_lock
 
-from typhon import log
+from typhon import log, ruv
 from typhon.atoms import getAtom
 from typhon.autohelp import autohelp, method
 from typhon.errors import Ejecting, UserException, userError
+from typhon.metrics import TurnStatistics
+from typhon.nanopass import CompilerFailed
 from typhon.objects.auditors import deepFrozenStamp
 from typhon.objects.constants import NullObject
 from typhon.objects.root import Object
@@ -36,6 +40,84 @@ class VatCheckpointed(Exception):
     """
 
 
+class Turn(object):
+    """
+    A single pending message delivery.
+
+    The resolver may be None, in which case the send was a sendOnly and
+    nobody is waiting on the result. sentAt is only stamped when the sending
+    vat is timing its turns, and is otherwise left at zero.
+    """
+
+    _immutable_ = True
+
+    def __init__(self, resolver, target, atom, args, namedArgs, sentAt=0.0):
+        self.resolver = resolver
+        self.target = target
+        self.atom = atom
+        self.args = args
+        self.namedArgs = namedArgs
+        self.sentAt = sentAt
+
+
+class TurnQueue(object):
+    """
+    A FIFO of pending turns, stored in a ring buffer.
+
+    Both pushing and popping are amortized O(1); the buffer doubles whenever
+    it fills up.
+    """
+
+    _head = 0
+    _size = 0
+
+    def __init__(self, capacity=8):
+        # The capacity must be a power of two, so that we can mask instead of
+        # taking remainders.
+        assert capacity > 0 and not capacity & (capacity - 1)
+        self._ring = [None] * capacity
+
+    def length(self):
+        return self._size
+
+    def _grow(self):
+        ring = self._ring
+        capacity = len(ring)
+        newRing = [None] * (capacity * 2)
+        for i in range(self._size):
+            newRing[i] = ring[(self._head + i) & (capacity - 1)]
+        self._ring = newRing
+        self._head = 0
+
+    def push(self, turn):
+        if self._size == len(self._ring):
+            self._grow()
+        mask = len(self._ring) - 1
+        self._ring[(self._head + self._size) & mask] = turn
+        self._size += 1
+
+    def pop(self):
+        if not self._size:
+            raise IndexError("Popped from empty turn queue")
+        head = self._head
+        turn = self._ring[head]
+        # Don't keep dead turns alive.
+        self._ring[head] = None
+        self._head = (head + 1) & (len(self._ring) - 1)
+        self._size -= 1
+        assert turn is not None, "Turn queue is corrupt"
+        return turn
+
+    def asList(self):
+        """
+        Copy the pending turns, in order, into a fresh list.
+        """
+
+        mask = len(self._ring) - 1
+        return [self._ring[(self._head + i) & mask]
+                for i in range(self._size)]
+
+
 @autohelp
 class Vat(Object):
     """
@@ -46,10 +128,19 @@ class Vat(Object):
 
     turnResolver = None
 
-    def __init__(self, manager, uv_loop, name=None, checkpoints=0):
+    # Whether this vat is currently sitting in its manager's ready queue.
+    # Only touched while holding the manager's ready lock.
+    _isReady = False
+
+    def __init__(self, manager, uv_loop, name=None, checkpoints=0,
+                 timeTurns=False):
         assert checkpoints != 0, "No, you can't create a zero-checkpoint vat"
         self.checkpoints = checkpoints
 
+        # Whether to read the clock around each turn for the duration and
+        # latency histograms. Off unless statistics were asked for.
+        self.timeTurns = timeTurns
+
         self._manager = manager
         self.uv_loop = uv_loop
 
@@ -59,7 +150,9 @@ class Vat(Object):
         self._callbacks = []
 
         self._pendingLock = allocate_lock()
-        self._pending = []
+        self._pending = TurnQueue()
+
+        self.statistics = TurnStatistics()
 
     def log(self, message, tags=[]):
         log.log(["vat"] + tags, u"Vat %s: %s" % (self.name, message))
@@ -69,8 +162,8 @@ class Vat(Object):
             checkpoints = u"%d checkpoints left" % self.checkpoints
         else:
             checkpoints = u"immortal"
-        return u"<vat(%s, %s, %d turns pending)>" % (self.name, checkpoints,
-                                                     len(self._pending))
+        return u"<vat(%s, %s, %d turns pending)>" % (
+            self.name, checkpoints, self._pending.length())
 
     @method("Any", "Any")
     def seed(self, f):
@@ -97,10 +190,33 @@ class Vat(Object):
         """
 
         vat = Vat(self._manager, self.uv_loop, name,
-                  checkpoints=checkpoints)
+                  checkpoints=checkpoints, timeTurns=self.timeTurns)
         self._manager.vats.append(vat)
         return vat
 
+    @method("Map")
+    def getStatistics(self):
+        """
+        Statistics about the turns which this vat has taken.
+
+        Durations are in seconds. Histograms are maps with a `"buckets"`
+        list, where bucket i counts durations under 2**i microseconds. The
+        histograms stay empty unless Typhon was started with `-stats`.
+        """
+
+        from typhon.objects.data import IntObject, StrObject
+        from typhon.objects.collections.maps import monteMap
+        stats = self.statistics
+        # XXX monteMap()
+        d = monteMap()
+        d[StrObject(u"turns")] = IntObject(stats.turns)
+        d[StrObject(u"pending")] = IntObject(self._pending.length())
+        d[StrObject(u"queueHighWater")] = IntObject(stats.queueHighWater)
+        d[StrObject(u"turnDurations")] = wrapHistogram(stats.turnDurations)
+        d[StrObject(u"deliveryLatencies")] = wrapHistogram(
+            stats.deliveryLatencies)
+        return d
+
     @method("Void")
     def traceQueueContents(self):
         """
@@ -108,11 +224,13 @@ class Vat(Object):
         """
         from typhon.objects.printers import toString
         debug_print("Pending queue for " + self.name.encode("utf-8"))
-        for (resolver, target, atom, args, namedArgs) in self._pending:
-            debug_print(toString(target).encode('utf-8') +
-                        "." + atom.verb.encode('utf-8') + "(" +
+        with self._pendingLock:
+            turns = self._pending.asList()
+        for turn in turns:
+            debug_print(toString(turn.target).encode('utf-8') +
+                        "." + turn.atom.verb.encode('utf-8') + "(" +
                         ', '.join([toString(a).encode('utf-8')
-                                   for a in args]) + ")")
+                                   for a in turn.args]) + ")")
         return NullObject
 
     def checkpoint(self, points=1):
@@ -131,19 +249,22 @@ class Vat(Object):
     def send(self, target, atom, args, namedArgs):
         from typhon.objects.refs import makePromise
         promise, resolver = makePromise()
-        with self._pendingLock:
-            self._pending.append((resolver, target, atom, args, namedArgs))
-            # self.log(u"Planning to send: %s<-%s(%s) (resolver: yes)" %
-            #          (target.toQuote(), atom.verb,
-            #           u", ".join([arg.toQuote() for arg in args])))
+        self._enqueue(Turn(resolver, target, atom, args, namedArgs,
+                           self._now()))
         return promise
 
     def sendOnly(self, target, atom, args, namedArgs):
+        self._enqueue(Turn(None, target, atom, args, namedArgs, self._now()))
+
+    def _now(self):
+        return time() if self.timeTurns else 0.0
+
+    def _enqueue(self, turn):
         with self._pendingLock:
-            self._pending.append((None, target, atom, args, namedArgs))
-            # self.log(u"Planning to send: %s<-%s(%s) (resolver: no)" %
-            #          (target.toQuote(), atom.verb,
-            #           u", ".join([arg.toQuote() for arg in args])))
+            self._pending.push(turn)
+            self.statistics.observeQueueDepth(self._pending.length())
+        if self._manager is not None:
+            self._manager.markReady(self)
 
     def hasTurns(self):
         # Note that if we have pending callbacks but no pending turns, we
@@ -151,23 +272,40 @@ class Vat(Object):
         # we'll take zero turns and then run our callbacks. This prevents
         # callbacks prepared in the initial turn from being skipped in the
         # event that there are no queued turns.
-        return len(self._pending) or len(self._callbacks)
+        return self._pending.length() or len(self._callbacks)
 
     def takeTurn(self):
+        with self._pendingLock:
+            turn = self._pending.pop()
+        self.deliver(turn)
+
+    def deliver(self, turn):
+        if self.timeTurns:
+            startedAt = time()
+            self._deliver(turn)
+            self.statistics.observeTurn(turn.sentAt, startedAt, time())
+        else:
+            self._deliver(turn)
+            self.statistics.countTurn()
+
+    def _deliver(self, turn):
         from typhon.objects.exceptions import sealException
         from typhon.objects.refs import Promise, resolution
 
-        with self._pendingLock:
-            resolver, target, atom, args, namedArgs = self._pending.pop(0)
-
-        # Set up our Miranda FAIL.
-        if namedArgs.extractStringKey(u"FAIL", None) is None:
-            if resolver is not None:
-                FAIL = resolver.makeSmasher()
-            else:
-                from typhon.objects.ejectors import theThrower
-                FAIL = theThrower
-            namedArgs = namedArgs.withStringKey(u"FAIL", FAIL)
+        resolver = turn.resolver
+        target = turn.target
+        atom = turn.atom
+        args = turn.args
+        namedArgs = turn.namedArgs
+
+        # Set up our Miranda FAIL. The resolver rides along in the turn, and
+        # only a turn with a resolver needs a FAIL other than the default
+        # thrower; otherwise, callAtom() will supply the prebuilt Miranda
+        # arguments and we don't allocate anything here.
+        if (resolver is not None and
+                namedArgs.extractStringKey(u"FAIL", None) is None):
+            namedArgs = namedArgs.withStringKey(u"FAIL",
+                                                resolver.makeSmasher())
 
         # If the target is a promise, then we should send to it instead of
         # calling. Try to resolve it as much as possible first, though.
@@ -213,11 +351,44 @@ class Vat(Object):
     def takeSomeTurns(self):
         # Limit the number of continuous turns to keep network latency low.
         # It's possible that more turns will be queued while we're taking
-        # these turns, after all.
-        count = len(self._pending)
-        # print "Taking", count, "turn(s) on", self.repr()
-        for _ in range(count):
-            self.takeTurn()
+        # these turns, after all. We swap out the entire queue at once, so
+        # that the lock is only taken once per batch rather than once per
+        # turn; anything sent during this batch lands in the fresh queue.
+        with self._pendingLock:
+            turns = self._pending
+            self._pending = TurnQueue()
+        # print "Taking", turns.length(), "turn(s) on", self.repr()
+        try:
+            while turns.length():
+                self.deliver(turns.pop())
+        finally:
+            if turns.length():
+                self._requeue(turns)
+
+    def _requeue(self, turns):
+        # A delivery blew up partway through a batch. Put the rest of the
+        # batch back in front of anything sent since, and make sure that
+        # somebody comes back for it.
+        with self._pendingLock:
+            while self._pending.length():
+                turns.push(self._pending.pop())
+            self._pending = turns
+        if self._manager is not None:
+            self._manager.markReady(self)
+
+
+def wrapHistogram(histogram):
+    from typhon.objects.collections.lists import wrapList
+    from typhon.objects.collections.maps import ConstMap, monteMap
+    from typhon.objects.data import DoubleObject, IntObject, StrObject
+    # XXX monteMap()
+    d = monteMap()
+    d[StrObject(u"count")] = IntObject(histogram.count)
+    d[StrObject(u"mean")] = DoubleObject(histogram.mean())
+    d[StrObject(u"max")] = DoubleObject(histogram.maximum)
+    d[StrObject(u"buckets")] = wrapList([IntObject(i)
+                                         for i in histogram.buckets])
+    return ConstMap(d)
 
 
 currentVat = ThreadLocalReference(Vat)
@@ -249,13 +420,168 @@ class scopedVat(object):
 class VatManager(object):
     """
     A collection of vats.
+
+    Vats with queued work place themselves on a ready queue, so that the
+    reactor only needs to visit vats which actually have turns to take.
+
+    All vats take their turns on the reactor's thread. The locks here only
+    guard against libuv callbacks and other vats on that same thread; Typhon
+    is not translated with thread support, and RPython's GC would serialize
+    any pool of turn-taking threads behind its GIL anyway. Vats therefore
+    never take turns in parallel.
     """
 
     def __init__(self):
         self.vats = []
+        self._readyLock = allocate_lock()
+        self._ready = []
+
+    def markReady(self, vat):
+        with self._readyLock:
+            if not vat._isReady:
+                vat._isReady = True
+                self._ready.append(vat)
+
+    def takeReadyVats(self):
+        """
+        Remove and return every ready vat, in the order that they became
+        ready.
+
+        A vat which is sent more messages after this call will be marked
+        ready again.
+        """
+
+        with self._readyLock:
+            ready = self._ready
+            self._ready = []
+            for vat in ready:
+                vat._isReady = False
+        return ready
 
     def anyVatHasTurns(self):
-        for vat in self.vats:
-            if vat.hasTurns():
-                return True
-        return False
+        return len(self._ready) != 0
+
+    def takeSlice(self, deadline):
+        """
+        Take turns in ready vats until none are left or the clock passes
+        `deadline`, in seconds since the epoch.
+
+        The deadline is only checked between rounds, so every vat that is
+        ready when the slice starts gets at least one round of turns. Returns
+        whether any vat still has turns to take.
+        """
+
+        while self.anyVatHasTurns():
+            for vat in self.takeReadyVats():
+                with scopedVat(vat) as vat:
+                    vat.takeSomeTurns()
+            if time() >= deadline:
+                break
+        return self.anyVatHasTurns()
+
+
+class TurnSlicer(object):
+    """
+    Drives vat turns from within the libuv loop.
+
+    An idle handle is active whenever any vat has turns to take; while it is
+    active, libuv polls for I/O without blocking, and each idle callback
+    takes turns for up to one time slice. A prepare handle, which does not
+    keep the loop alive on its own, runs just before every poll and wakes
+    the idle handle if I/O callbacks have readied any vats.
+
+    Exceptions cannot unwind through libuv, and RPython's callback wrapper
+    would only print and discard them. So an exception escaping a slice is
+    kept here, the loop is stopped, and runUntilDone() raises it again.
+    """
+
+    vatManager = None
+    uv_loop = None
+    recorder = None
+    idle = None
+    prepare = None
+    idling = False
+    failure = None
+
+    # Seconds.
+    timeSlice = 0.0
+
+    def setUp(self, vatManager, uv_loop, recorder, turnSlice):
+        self.vatManager = vatManager
+        self.uv_loop = uv_loop
+        self.recorder = recorder
+        self.timeSlice = turnSlice / 1000.0
+        self.idle = ruv.alloc_idle(uv_loop)
+        self.prepare = ruv.alloc_prepare(uv_loop)
+        ruv.prepareStart(self.prepare, prepareForPoll)
+        ruv.unref(self.prepare)
+
+    def wake(self):
+        if not self.idling and self.vatManager.anyVatHasTurns():
+            ruv.idleStart(self.idle, takeTurnSlice)
+            self.idling = True
+
+    def sleep(self):
+        if self.idling:
+            ruv.idleStop(self.idle)
+            self.idling = False
+
+    def takeSlice(self):
+        deadline = time() + self.timeSlice
+        try:
+            with self.recorder.context("Time spent in vats"):
+                busy = self.vatManager.takeSlice(deadline)
+        except Exception as e:
+            self.failure = e
+            self.sleep()
+            ruv.stop(self.uv_loop)
+            return
+        if not busy:
+            # Let the next poll block.
+            self.sleep()
+
+    def reraise(self):
+        failure = self.failure
+        if failure is not None:
+            self.failure = None
+            raise failure
+
+    def tearDown(self):
+        self.sleep()
+        ruv.prepareStop(self.prepare)
+        ruv.closeAndFree(self.idle)
+        ruv.closeAndFree(self.prepare)
+
+_slicer = TurnSlicer()
+
+
+def takeTurnSlice(idle):
+    _slicer.takeSlice()
+
+
+def prepareForPoll(prepare):
+    ruv.cleanup()
+    _slicer.wake()
+
+
+def runUntilDone(vatManager, uv_loop, recorder, turnSlice):
+    # This may take a while.
+    _slicer.setUp(vatManager, uv_loop, recorder, turnSlice)
+    try:
+        # The loop can stop while vats still have turns; for example, an I/O
+        # callback might queue a turn while closing the last live handle. So
+        # we keep restarting it until there's truly nothing left to do.
+        while vatManager.anyVatHasTurns() or ruv.loopAlive(uv_loop):
+            _slicer.wake()
+            with recorder.context("Time spent in I/O"):
+                ruv.run(uv_loop, ruv.RUN_DEFAULT)
+            try:
+                _slicer.reraise()
+            except CompilerFailed as cf:
+                debug_print("Caught fatal exception while reacting:",
+                        cf.formatError())
+                raise
+    finally:
+        _slicer.tearDown()
+        # Let the handles finish closing.
+        ruv.run(uv_loop, ruv.RUN_NOWAIT)